@@ -1,8 +1,15 @@
 import os
+import json
+import time
+import hashlib
 import logging
-from flask import Flask, render_template, redirect, url_for, flash, request, jsonify
+import threading
+from flask import Flask, Response, render_template, redirect, url_for, flash, request, jsonify, session, stream_with_context
 from datetime import datetime
 
+import config
+from utils.status_store import changed_fields, status_store
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -12,7 +19,7 @@ logger = logging.getLogger('web_server')
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", os.urandom(24))
 
-# Global variable to store bot status - will be updated by main.py
+# Status of the bot in this process - updated by main.py and published to the status store
 bot_status = {
     "connected": False,
     "name": "Harmonia",
@@ -24,29 +31,80 @@ bot_status = {
     "active_music_sessions": 0
 }
 
+# Rendered responses per route: {name: (version, etag, body)}
+_response_cache = {}
+
+# Each live status stream holds a worker thread; leave the rest for normal requests
+_stream_slots = threading.BoundedSemaphore(config.STATUS_STREAM_MAX_CLIENTS)
+
+def current_status():
+    """Latest status published by the bot process (possibly another process), or the offline defaults."""
+    return current_status_versioned()[1]
+
+def current_status_versioned():
+    """Return (version, status); the version changes whenever the status does."""
+    version, status = status_store.read_versioned()
+    return version, status or bot_status
+
+def cached_response(name, version, build, mimetype='text/html'):
+    """
+    Serve a response rendered once per version, with a strong ETag.
+    
+    `build` is only called when the version changed since the last render.
+    Clients sending a matching If-None-Match get an empty 304. The ETag is a
+    hash of the body, so every worker process hands out the same one.
+    """
+    if session.get('_flashes'):
+        # One-off page with flashed messages; don't cache it
+        return build()
+    
+    cached = _response_cache.get(name)
+    if cached is None or cached[0] != version:
+        body = build()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        cached = (version, hashlib.blake2b(body, digest_size=16).hexdigest(), body)
+        _response_cache[name] = cached
+    _, etag, body = cached
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    # Let browsers keep a copy but check it with If-None-Match every time
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.context_processor
+def inject_now():
+    return {'now': datetime.now()}
+
 @app.route('/')
 def index():
     """Homepage showing bot status and stats."""
     # Add current datetime for the template
     now = datetime.now()
+    version, status = current_status_versioned()
     
-    return render_template('index.html', 
-                          bot_status=bot_status,
-                          now=now)
+    return cached_response('index', (version, now.year), lambda: render_template('index.html',
+                                                                              bot_status=status,
+                                                                              now=now))
 
 @app.route('/guilds')
 def guilds():
     """Page showing all connected guilds."""
-    if not bot_status["connected"]:
+    version, status = current_status_versioned()
+    if not status["connected"]:
         flash("Bot is not connected.", "danger")
         return redirect(url_for('index'))
     
     # Add current datetime for the template
     now = datetime.now()
     
-    return render_template('guilds.html', 
-                         bot_status=bot_status,
-                         now=now)
+    return cached_response('guilds', (version, now.year), lambda: render_template('guilds.html',
+                                                                               bot_status=status,
+                                                                               now=now))
 
 @app.route('/actors')
 def actors():
@@ -55,29 +113,28 @@ def actors():
     now = datetime.now()
     
     try:
-        from utils.actor_database import ActorDatabase
-        import asyncio
+        from utils.actor_catalog import sync_actor_catalog
         
-        actor_db = ActorDatabase()
-        # Create event loop to run the async load_actors method
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(actor_db.load_actors())
+        status_version, status = current_status_versioned()
+        actors_version = sync_actor_catalog.version()
         
-        # Get categories
-        hollywood_actors = loop.run_until_complete(actor_db.get_actors_by_category("hollywood"))
-        bollywood_actors = loop.run_until_complete(actor_db.get_actors_by_category("bollywood"))
+        def render():
+            # Get categories
+            hollywood_actors = sync_actor_catalog.get_category("hollywood")
+            bollywood_actors = sync_actor_catalog.get_category("bollywood")
+            
+            return render_template('actors.html',
+                                 bot_status=status,
+                                 hollywood_actors=hollywood_actors,
+                                 bollywood_actors=bollywood_actors,
+                                 now=now)
         
-        return render_template('actors.html',
-                             bot_status=bot_status,
-                             hollywood_actors=hollywood_actors,
-                             bollywood_actors=bollywood_actors,
-                             now=now)
+        return cached_response('actors', (actors_version, status_version, now.year), render)
     except Exception as e:
         logger.error(f"Error loading actors: {e}")
         flash(f"Error loading actors: {str(e)}", "danger")
         return render_template('actors.html',
-                             bot_status=bot_status,
+                             bot_status=current_status(),
                              hollywood_actors=[],
                              bollywood_actors=[],
                              now=now)
@@ -86,8 +143,7 @@ def actors():
 def add_actor():
     """Add a new actor to the database."""
     try:
-        from utils.actor_database import ActorDatabase
-        import asyncio
+        from utils.actor_catalog import sync_actor_catalog
         
         category = request.form.get('category')
         actor_name = request.form.get('actor_name')
@@ -96,16 +152,8 @@ def add_actor():
             flash("Category and actor name are required.", "danger")
             return redirect(url_for('actors'))
         
-        actor_db = ActorDatabase()
-        # Create event loop to run the async add_actor method
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        # Load actors first
-        loop.run_until_complete(actor_db.load_actors())
-        
-        # Add the actor
-        success = loop.run_until_complete(actor_db.add_actor(category.lower(), actor_name))
+        # Add the actor; the shared catalog saves it
+        success = sync_actor_catalog.add(category.lower(), actor_name)
         
         if success:
             flash(f"Actor '{actor_name}' added to {category} successfully.", "success")
@@ -121,8 +169,7 @@ def add_actor():
 def remove_actor():
     """Remove an actor from the database."""
     try:
-        from utils.actor_database import ActorDatabase
-        import asyncio
+        from utils.actor_catalog import sync_actor_catalog
         
         category = request.form.get('category')
         actor_name = request.form.get('actor_name')
@@ -131,16 +178,8 @@ def remove_actor():
             flash("Category and actor name are required.", "danger")
             return redirect(url_for('actors'))
         
-        actor_db = ActorDatabase()
-        # Create event loop to run the async remove_actor method
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        # Load actors first
-        loop.run_until_complete(actor_db.load_actors())
-        
-        # Remove the actor
-        success = loop.run_until_complete(actor_db.remove_actor(category.lower(), actor_name))
+        # Remove the actor; the shared catalog saves it
+        success = sync_actor_catalog.remove(category.lower(), actor_name)
         
         if success:
             flash(f"Actor '{actor_name}' removed from {category} successfully.", "success")
@@ -155,21 +194,73 @@ def remove_actor():
 @app.route('/api/bot-status')
 def api_bot_status():
     """API endpoint to get the bot status."""
-    return jsonify(bot_status)
+    version, status = current_status_versioned()
+    return cached_response('api_bot_status', version,
+                           lambda: json.dumps(status, separators=(',', ':')),
+                           mimetype='application/json')
 
-# Function to update bot status - will be called from main.py
-def update_bot_status(bot=None):
-    """Update the bot status with the latest information."""
-    global bot_status
+@app.route('/api/bot-status/stream')
+def api_bot_status_stream():
+    """
+    Server-sent events with the fields of the bot status that changed.
     
+    The first event carries the whole status, later ones only what changed
+    since the previous event. The stream ends after STATUS_STREAM_MAX_AGE
+    seconds so it doesn't hold a worker thread forever; the browser reconnects
+    on its own. At most STATUS_STREAM_MAX_CLIENTS streams run per process;
+    beyond that the request gets a 503 and the page falls back to polling.
+    """
+    if not _stream_slots.acquire(blocking=False):
+        return Response("Too many live status streams; poll /api/bot-status instead.\n", status=503,
+                        mimetype='text/plain', headers={'Retry-After': str(config.STATUS_STREAM_MAX_AGE)})
+    
+    def events():
+        last = None
+        last_version = None
+        started = last_beat = time.monotonic()
+        yield f"retry: {config.STATUS_STREAM_RETRY_MS}\n\n"
+        while time.monotonic() - started < config.STATUS_STREAM_MAX_AGE:
+            version, status = current_status_versioned()
+            if version != last_version:
+                # Only diff when there is a new snapshot
+                changes = changed_fields(last, status)
+                last, last_version = status, version
+                if changes:
+                    yield f"id: {version[0]}\nevent: status\ndata: {json.dumps(changes, separators=(',', ':'))}\n\n"
+                    last_beat = time.monotonic()
+            if time.monotonic() - last_beat >= 15:
+                # Comment line to keep proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                last_beat = time.monotonic()
+            time.sleep(config.STATUS_STREAM_POLL)
+    
+    response = Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Called by the server when the stream ends or the client goes away
+    response.call_on_close(_stream_slots.release)
+    return response
+
+@app.route('/api/stats')
+@app.route('/api/stats/<int:guild_id>')
+def api_stats(guild_id=None):
+    """API endpoint with precomputed game stats: hardest items, plus a guild's totals and leaderboard."""
+    from utils.game_stats import read_stats
+    return jsonify(read_stats(config.STATS_DB_PATH, guild_id))
+
+# Function to update bot status - will be called from main.py
+def build_bot_status(bot=None):
+    """Return a new status dict with the latest information, leaving the shared bot_status alone."""
     if not bot or not bot.is_ready():
-        bot_status["connected"] = False
-        return bot_status
+        return dict(bot_status, connected=False)
     
-    # Update bot information
-    bot_status["connected"] = True
-    bot_status["name"] = bot.user.name
-    bot_status["id"] = bot.user.id
+    # Bot information
+    status = {
+        "connected": True,
+        "name": bot.user.name,
+        "id": bot.user.id
+    }
     
     # Get guild information
     guilds = []
@@ -183,24 +274,37 @@ def update_bot_status(bot=None):
         })
         user_count += guild.member_count
     
-    bot_status["guilds"] = guilds
-    bot_status["guild_count"] = len(guilds)
-    bot_status["user_count"] = user_count
+    status["guilds"] = guilds
+    status["guild_count"] = len(guilds)
+    status["user_count"] = user_count
     
     # Get game statistics
     game_cog = bot.get_cog('ActorGame')
     active_games = 0
     if game_cog and hasattr(game_cog, 'active_games'):
         active_games = len(game_cog.active_games)
-    bot_status["active_games"] = active_games
+    status["active_games"] = active_games
     
     # Get music statistics
     music_cog = bot.get_cog('MusicPlayer')
     active_music_sessions = 0
     if music_cog and hasattr(music_cog, 'music_queues'):
         active_music_sessions = len(music_cog.music_queues)
-    bot_status["active_music_sessions"] = active_music_sessions
+    status["active_music_sessions"] = active_music_sessions
+    
+    # Get lyrics cache and Genius circuit breaker metrics
+    from utils.lyrics_fetcher import lyrics_metrics
+    status["lyrics"] = lyrics_metrics()
+    
+    # Get DM fan-out latency for the game
+    from utils.dm_broadcast import dm_broadcast_stats
+    status["dm_broadcast"] = dm_broadcast_stats()
     
+    return status
+
+def update_bot_status(bot=None):
+    """Update the bot status with the latest information."""
+    bot_status.update(build_bot_status(bot))
     return bot_status
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Compare the old regex-based Genius lyrics extraction with the streaming extractor.
+
+Usage:
+    python benchmarks/lyrics_extraction.py [saved_page.html ...]
+
+Pass pages saved from genius.com (e.g. with "Save Page As > HTML only"). With no
+arguments a synthetic ~400 KB page shaped like a Genius song page is used.
+Reports CPU time per extraction and peak traced memory for each method.
+"""
+import codecs
+import html
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lyrics_parser import LyricsStreamExtractor
+
+CHUNK_SIZE = 16 * 1024
+REPEATS = 20
+
+def legacy_extract(page: bytes) -> str:
+    """The previous implementation: decode the whole page, then regex over it."""
+    html_content = page.decode('utf-8', errors='replace')
+    lyrics_patterns = [
+        r'<div data-lyrics-container="true".*?>(.*?)</div>',
+        r'<div class="lyrics">(.*?)</div>',
+        r'<div class="Lyrics__Container-.*?>(.*?)</div>'
+    ]
+    for pattern in lyrics_patterns:
+        matches = re.findall(pattern, html_content, re.DOTALL)
+        if matches:
+            lyrics = re.sub(r'<br\s*/?>', '\n', "".join(matches))
+            lyrics = re.sub(r'<[^>]+>', '', lyrics)
+            lyrics = html.unescape(lyrics)
+            return re.sub(r'\n{3,}', '\n\n', lyrics).strip()
+    return ""
+
+def streaming_extract(page: bytes) -> str:
+    """The new implementation: decode and parse chunk by chunk, stopping after the lyrics."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    extractor = LyricsStreamExtractor()
+    for i in range(0, len(page), CHUNK_SIZE):
+        if extractor.feed(decoder.decode(page[i:i + CHUNK_SIZE])):
+            break
+    return extractor.result() or ""
+
+def synthetic_page() -> bytes:
+    """Build a page with a large head, several lyrics containers and a large trailing script payload."""
+    head = "<html><head>" + "".join(
+        f'<link rel="preload" href="/assets/chunk-{i}.js"><script>window.__x{i}={{"k":"{"v" * 200}"}}</script>'
+        for i in range(300)
+    ) + "</head><body><main>"
+    stanzas = []
+    for s in range(8):
+        lines = "<br/>".join(
+            f'<a href="/annotations/{s}{n}" class="ReferentFragment"><span>Line {n} of verse {s} &amp; more words here</span></a>'
+            for n in range(8)
+        )
+        stanzas.append(
+            f'<div data-lyrics-container="true" class="Lyrics__Container-sc-1ynbvzw-1 kUgSbL">[Verse {s}]<br/>{lines}</div>'
+            '<div class="RightSidebar__Container"><div class="ad">Advertisement</div></div>'
+        )
+    tail = '<div class="LyricsFooter">' + "<p>Footer</p>" * 500 + "</div>" \
+        + "<script>window.__PRELOADED_STATE__ = JSON.parse('" + "x" * 250000 + "');</script></main></body></html>"
+    return (head + "".join(stanzas) + tail).encode('utf-8')
+
+def measure(func, page: bytes):
+    """Return (CPU ms per call, peak traced KB, result) for func(page)."""
+    start = time.process_time()
+    for _ in range(REPEATS):
+        result = func(page)
+    cpu_ms = (time.process_time() - start) * 1000 / REPEATS
+    
+    tracemalloc.start()
+    func(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return cpu_ms, peak / 1024, result
+
+def main():
+    pages = [(path, open(path, 'rb').read()) for path in sys.argv[1:]]
+    if not pages:
+        pages = [("synthetic", synthetic_page())]
+    
+    print(f"{'page':<30} {'size KB':>8} {'method':<10} {'CPU ms':>8} {'peak KB':>9} {'lyrics chars':>13}")
+    for name, page in pages:
+        for label, func in (("regex", legacy_extract), ("streaming", streaming_extract)):
+            cpu_ms, peak_kb, result = measure(func, page)
+            print(f"{os.path.basename(name)[:30]:<30} {len(page) / 1024:>8.0f} {label:<10} "
+                  f"{cpu_ms:>8.2f} {peak_kb:>9.0f} {len(result):>13}")
+
+if __name__ == "__main__":
+    main()
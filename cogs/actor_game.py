@@ -1,15 +1,20 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
 import logging
-import random
 import time
-import json
-import os
 from typing import Dict, List, Optional, Set
 
 import config
 from utils.game_manager import GameSession, Player
+from utils.actor_catalog import actor_catalog
+from utils.name_matcher import compact
+from utils.dm_broadcast import broadcast_dms
+from utils.deadline_scheduler import DeadlineScheduler
+from utils.session_journal import SessionJournal
+from utils.shuffle_bag import ShuffleBags
+from utils.game_stats import GameStats
+from utils.category_registry import category_registry
 
 logger = logging.getLogger('discord_bot.actor_game')
 
@@ -18,60 +23,119 @@ class ActorGame(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.game_sessions: Dict[int, GameSession] = {}  # {guild_id: GameSession}
-        self.actors = self._load_actors()
-        self.check_inactive_games.start()
+        self.game_sessions: Dict[int, GameSession] = {}  # {channel_id: GameSession}
+        self.guild_games: Dict[int, Set[int]] = {}  # {guild_id: {channel_id}} for per-guild lookups
+        # Ends each game exactly when it has been idle for GAME_TIMEOUT
+        self.inactivity = DeadlineScheduler("game-inactivity", self._expire_game)
+        # Records every session change so games survive a restart
+        self.journal = SessionJournal()
+        # Per-server, per-category non-repeating deals
+        self.shuffle_bags = ShuffleBags()
+        # Wins, streaks and item difficulty for =leaderboard and =mystats
+        self.stats = GameStats(config.STATS_DB_PATH)
     
-    def _load_actors(self) -> Dict[str, List[str]]:
-        """Load actor data from the JSON file."""
-        try:
-            with open('data/actors.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.warning("Actors database file not found. Creating a new one.")
-            # Create a default actors dictionary
-            default_actors = {
-                "Hollywood": [
-                    "Tom Hanks", "Leonardo DiCaprio", "Brad Pitt", "Meryl Streep", 
-                    "Jennifer Lawrence", "Denzel Washington", "Robert Downey Jr.",
-                    "Scarlett Johansson", "Tom Cruise", "Emma Stone"
-                ],
-                "Bollywood": [
-                    "Shah Rukh Khan", "Amitabh Bachchan", "Deepika Padukone", 
-                    "Aamir Khan", "Priyanka Chopra", "Salman Khan", "Alia Bhatt",
-                    "Hrithik Roshan", "Katrina Kaif", "Ranbir Kapoor"
-                ]
-            }
-            
-            # Save the default actors to the file
-            os.makedirs('data', exist_ok=True)
-            with open('data/actors.json', 'w', encoding='utf-8') as f:
-                json.dump(default_actors, f, indent=4)
-            
-            return default_actors
+    async def cog_load(self):
+        """Warm the shared actor catalog and resume games saved in the session journal."""
+        await actor_catalog.ensure_loaded()
+        await category_registry.refresh()
+        
+        sessions = await asyncio.to_thread(self.journal.load)
+        now = time.time()
+        resumed = []
+        expired = 0
+        for session in sessions.values():
+            self._add_session(session, record=False)
+            if session.last_activity + config.GAME_TIMEOUT > now and len(resumed) < config.MAX_ACTIVE_GAMES:
+                resumed.append(session)
+            else:
+                # Timed out while the bot was down (or over the game cap): end it like a live expiry, quietly
+                self._end_session(session.channel_id, "timeout")
+                expired += 1
+        
+        # Drop ended and expired games from the journal
+        await asyncio.wrap_future(self.journal.compact(self.game_sessions))
+        
+        if expired:
+            logger.info(f"Ended {expired} journaled game sessions that expired while the bot was down or were over the game limit")
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} game sessions from the journal")
+            self.bot.loop.create_task(self._announce_resumed(resumed))
     
     def cog_unload(self):
         """Cleanup when the cog is unloaded."""
-        self.check_inactive_games.cancel()
-    
-    @tasks.loop(minutes=1)
-    async def check_inactive_games(self):
-        """Check and remove inactive game sessions."""
-        current_time = time.time()
-        
-        for guild_id, session in list(self.game_sessions.items()):
-            if current_time - session.last_activity > config.GAME_TIMEOUT:
-                channel = self.bot.get_channel(session.channel_id)
-                if channel:
-                    await channel.send("⏲️ Game ended due to inactivity.")
-                
-                del self.game_sessions[guild_id]
-                logger.info(f"Game session in guild {guild_id} ended due to inactivity")
+        self.inactivity.stop()
+        self.journal.close()
+        self.stats.close()
     
-    @check_inactive_games.before_loop
-    async def before_check_inactive_games(self):
-        """Wait until the bot is ready before starting the task."""
+    async def _announce_resumed(self, sessions: List[GameSession]) -> None:
+        """Tell each resumed game's channel that the game is still on."""
         await self.bot.wait_until_ready()
+        for session in sessions:
+            channel = self.bot.get_channel(session.channel_id)
+            if channel is None:
+                continue
+            state = "in progress" if session.is_in_progress else "waiting for players"
+            try:
+                await channel.send(f"🔄 The bot restarted, but your **{category_registry.get(session.category).name}** game is still {state}. Carry on!")
+            except discord.HTTPException as e:
+                logger.warning(f"Couldn't announce resumed game in channel {session.channel_id}: {e}")
+    
+    @property
+    def active_games(self) -> Dict[int, GameSession]:
+        """All running games, keyed by channel ID (used by the web dashboard)."""
+        return self.game_sessions
+    
+    def games_in_guild(self, guild_id: int) -> List[GameSession]:
+        """Return the games running in a guild."""
+        return [self.game_sessions[channel_id] for channel_id in self.guild_games.get(guild_id, ())]
+    
+    def _add_session(self, session: GameSession, record: bool = True) -> None:
+        """Register a new game and schedule its inactivity deadline."""
+        self.game_sessions[session.channel_id] = session
+        self.guild_games.setdefault(session.guild_id, set()).add(session.channel_id)
+        self.inactivity.schedule(session.channel_id, session.last_activity + config.GAME_TIMEOUT)
+        if record:
+            self.journal.record_start(session)
+    
+    def _end_session(self, channel_id: int, reason: str) -> Optional[GameSession]:
+        """Remove a game from the session and guild indexes and record its result."""
+        session = self.game_sessions.pop(channel_id, None)
+        if session is None:
+            return None
+        
+        channels = self.guild_games.get(session.guild_id)
+        if channels is not None:
+            channels.discard(channel_id)
+            if not channels:
+                del self.guild_games[session.guild_id]
+        
+        self.inactivity.cancel(channel_id)
+        self.journal.record_end(channel_id)
+        self.journal.maybe_compact(self.game_sessions)
+        self.stats.record_game_end(session, reason)
+        return session
+    
+    async def _expire_game(self, channel_id: int) -> Optional[float]:
+        """End a game whose inactivity deadline has passed, or return its new deadline if there was activity since."""
+        session = self.game_sessions.get(channel_id)
+        if session is None:
+            return None
+        
+        deadline = session.last_activity + config.GAME_TIMEOUT
+        if deadline > time.time():
+            return deadline
+        
+        self._end_session(channel_id, "timeout")
+        logger.info(f"Game session in channel {channel_id} (guild {session.guild_id}) ended due to inactivity")
+        
+        channel = self.bot.get_channel(channel_id)
+        if channel:
+            await channel.send("⏲️ Game ended due to inactivity.")
+        return None
+    
+    async def _categories_list(self) -> str:
+        """Display names of all playable categories, for help messages."""
+        return ", ".join(category_registry.get(key).name for key in await actor_catalog.categories())
     
     @commands.command(name="startgame")
     async def start_game(self, ctx, category=None):
@@ -79,39 +143,51 @@ class ActorGame(commands.Cog):
         Start a new 'Guess It' game.
         
         Usage: =startgame [category]
-        Available categories: Hollywood, Bollywood, Apps, Food
+        Categories come from the category registry; running the command
+        without one lists them.
         
         Once started, players can ask questions directly in chat or use the =question command.
         """
         guild_id = ctx.guild.id
         
-        # Check if a game is already running in this guild
-        if guild_id in self.game_sessions:
-            await ctx.send("❌ A game is already running in this server. Use `=endgame` to end it first.")
+        # Check if a game is already running in this channel
+        if ctx.channel.id in self.game_sessions:
+            await ctx.send("❌ A game is already running in this channel. Use `=endgame` to end it first.")
+            return
+        
+        # Keep a cap on parallel games per server and overall
+        if len(self.guild_games.get(guild_id, ())) >= config.MAX_GAMES_PER_GUILD:
+            await ctx.send(f"❌ This server already has {config.MAX_GAMES_PER_GUILD} games running. Try again when one ends.")
+            return
+        if len(self.game_sessions) >= config.MAX_ACTIVE_GAMES:
+            await ctx.send("❌ Too many games are running right now. Please try again later.")
             return
         
         # Validate category
         if category is None:
             # If no category is provided, list available categories
-            categories_list = ", ".join(config.CATEGORIES)
+            categories_list = await self._categories_list()
             await ctx.send(f"Please specify a category: `=startgame <category>`\nAvailable categories: {categories_list}")
             return
         
-        # Check if the provided category matches any of the allowed categories (case insensitive)
-        for allowed_category in config.CATEGORIES:
-            if category.lower() == allowed_category.lower():
-                category = allowed_category
-                break
-        else:  # This else belongs to the for loop, executes if no break occurred
-            categories_list = ", ".join(config.CATEGORIES)
+        # Resolve the name, key or alias (case insensitive) to a category
+        await category_registry.refresh()
+        info = category_registry.resolve(category)
+        if info is None and await actor_catalog.has_category(category):
+            # In the data file but not in the manifest
+            info = category_registry.get(category)
+        if info is None or not await actor_catalog.has_category(info.key):
+            categories_list = await self._categories_list()
             await ctx.send(f"❌ Invalid category. Available categories: {categories_list}")
             return
+        category = info.name
         
         # Create a new game session
         session = GameSession(
             host_id=ctx.author.id,
             channel_id=ctx.channel.id,
-            category=category
+            category=info.key,
+            guild_id=guild_id
         )
         
         # Add the host as the first player
@@ -120,7 +196,7 @@ class ActorGame(commands.Cog):
             name=ctx.author.display_name
         ))
         
-        self.game_sessions[guild_id] = session
+        self._add_session(session)
         
         # Send game start message
         embed = discord.Embed(
@@ -140,19 +216,19 @@ class ActorGame(commands.Cog):
         ), inline=False)
         
         await ctx.send(embed=embed)
-        logger.info(f"Game started in guild {guild_id} with category {category}")
+        logger.info(f"Game started in channel {ctx.channel.id} of guild {guild_id} with category {category}")
     
     @commands.command(name="join")
     async def join_game(self, ctx):
         """Join an ongoing 'Guess It' game."""
         guild_id = ctx.guild.id
         
-        # Check if a game is running in this guild
-        if guild_id not in self.game_sessions:
-            await ctx.send("❌ No game is currently running. Start one with `=startgame`.")
+        # Check if a game is running in this channel
+        if ctx.channel.id not in self.game_sessions:
+            await ctx.send("❌ No game is currently running in this channel. Start one with `=startgame`.")
             return
         
-        session = self.game_sessions[guild_id]
+        session = self.game_sessions[ctx.channel.id]
         
         # Check if the game is already in progress (actors assigned)
         if session.is_in_progress:
@@ -170,15 +246,15 @@ class ActorGame(commands.Cog):
             return
         
         # Add the player to the game
-        session.add_player(Player(
+        player = Player(
             id=ctx.author.id,
             name=ctx.author.display_name
-        ))
-        
-        session.last_activity = time.time()
+        )
+        session.add_player(player)
+        self.journal.record_join(session, player)
         
         # Get all player mentions
-        player_mentions = [f"<@{player.id}>" for player in session.players]
+        player_mentions = [f"<@{player.id}>" for player in session.players.values()]
         
         # Send confirmation message
         await ctx.send(f"✅ {ctx.author.mention} joined the game!")
@@ -186,7 +262,7 @@ class ActorGame(commands.Cog):
         # Update the players list in an embed
         embed = discord.Embed(
             title="🎭 Guess It Game",
-            description=f"Category: **{session.category}**\n\n"
+            description=f"Category: **{category_registry.get(session.category).name}**\n\n"
                        f"Current players ({len(session.players)}/{config.MAX_PLAYERS}):",
             color=discord.Color.blue()
         )
@@ -201,12 +277,12 @@ class ActorGame(commands.Cog):
         """Assign actors to players and start the game (host only)."""
         guild_id = ctx.guild.id
         
-        # Check if a game is running in this guild
-        if guild_id not in self.game_sessions:
-            await ctx.send("❌ No game is currently running. Start one with `=startgame`.")
+        # Check if a game is running in this channel
+        if ctx.channel.id not in self.game_sessions:
+            await ctx.send("❌ No game is currently running in this channel. Start one with `=startgame`.")
             return
         
-        session = self.game_sessions[guild_id]
+        session = self.game_sessions[ctx.channel.id]
         
         # Check if the command was issued by the host
         if ctx.author.id != session.host_id:
@@ -223,86 +299,66 @@ class ActorGame(commands.Cog):
             await ctx.send(f"❌ Need at least {config.MIN_PLAYERS} players to start. Currently: {len(session.players)}.")
             return
         
-        # Get actors for the selected category (case-insensitive)
-        category_key = None
-        for key in self.actors.keys():
-            if key.lower() == session.category.lower():
-                category_key = key
-                break
+        # Get the wording for the category's items
+        category = category_registry.get(session.category)
+        item_type = category.noun
         
-        if category_key:
-            category_actors = self.actors[category_key]
-        else:
-            category_actors = []
+        # Deal actors from the server's shuffle bag, so nobody sees a repeat until the category is used up
+        selected_actors = await self.shuffle_bags.deal(actor_catalog, session.guild_id, session.category, len(session.players))
         
-        if not category_actors:
-            await ctx.send(f"❌ No actors found for category '{session.category}'.")
+        if not selected_actors:
+            await ctx.send(f"❌ No {category.plural} found for category '{category.name}'.")
             return
         
-        # Randomly select actors for each player
-        selected_actors = random.sample(category_actors, len(session.players))
+        if len(selected_actors) < len(session.players):
+            await ctx.send(f"❌ Not enough {category.plural} in category '{category.name}' for {len(session.players)} players.")
+            return
         
         # Assign actors to players
-        for i, player in enumerate(session.players):
-            player.actor = selected_actors[i]
-        
-        session.is_in_progress = True
-        session.last_activity = time.time()
+        session.assign_actors(selected_actors)
+        self.journal.record_assign(session)
         
-        # Notify players of actor assignments via DM
-        for i, player in enumerate(session.players):
+        # Notify players of actor assignments via DM, all at once
+        messages = []
+        for player in session.players.values():
             member = ctx.guild.get_member(player.id)
             if member:
                 # Create a list of other players and their actors
                 others_actors = []
-                for other_player in session.players:
+                for other_player in session.players.values():
                     if other_player.id != player.id:
                         others_actors.append(f"{other_player.name}: **{other_player.actor}**")
                 
-                try:
-                    # Get the correct term based on the category
-                    item_type = "actor"
-                    if session.category.lower() == "apps":
-                        item_type = "app"
-                    elif session.category.lower() == "food":
-                        item_type = "food item"
-                    
-                    # Send DM to player
-                    embed = discord.Embed(
-                        title=f"🎭 Your {item_type.capitalize()} Assignment",
-                        description=(
-                            f"Game in server: **{ctx.guild.name}**\n"
-                            f"Category: **{session.category}**\n\n"
-                            f"You need to guess your {item_type} by asking questions!\n"
-                            f"Just chat normally in the channel to ask questions.\n"
-                            f"When ready to guess, use `=guess <{item_type} name>`."
-                        ),
-                        color=discord.Color.gold()
-                    )
-                    
-                    embed.add_field(
-                        name=f"Other Players' {item_type.capitalize()}s",
-                        value="\n".join(others_actors) or "No other players",
-                        inline=False
-                    )
-                    
-                    await member.send(embed=embed)
-                except discord.Forbidden:
-                    # If we can't DM the user
-                    await ctx.send(f"⚠️ Couldn't send a DM to {member.mention}. Please enable DMs from server members.")
-        
-        # Get the correct term based on the category
-        item_type = "actor"
-        if session.category.lower() == "apps":
-            item_type = "app"
-        elif session.category.lower() == "food":
-            item_type = "food item"
+                embed = discord.Embed(
+                    title=f"🎭 Your {item_type.capitalize()} Assignment",
+                    description=(
+                        f"Game in server: **{ctx.guild.name}**\n"
+                        f"Category: **{category.name}**\n\n"
+                        f"You need to guess your {item_type} by asking questions!\n"
+                        f"Just chat normally in the channel to ask questions.\n"
+                        f"When ready to guess, use `=guess <{item_type} name>`."
+                    ),
+                    color=discord.Color.gold()
+                )
+                
+                embed.add_field(
+                    name=f"Other Players' {category.plural.capitalize()}",
+                    value="\n".join(others_actors) or "No other players",
+                    inline=False
+                )
+                
+                messages.append((member, {"embed": embed}))
+        
+        result = await broadcast_dms(messages)
+        if result.undelivered:
+            # One message for everyone we couldn't reach
+            await ctx.send(result.failure_summary())
         
         # Send confirmation in the game channel
         embed = discord.Embed(
             title="🎭 Game Started!",
             description=(
-                f"{item_type.capitalize()}s have been assigned to all players via DM!\n\n"
+                f"{category.plural.capitalize()} have been assigned to all players via DM!\n\n"
                 f"**How to play:**\n"
                 f"- You know everyone's {item_type} except your own\n"
                 f"- Ask questions by just chatting normally in the channel\n"
@@ -327,11 +383,11 @@ class ActorGame(commands.Cog):
         guild_id = ctx.guild.id
         
         # Check if a game is running
-        if guild_id not in self.game_sessions:
-            await ctx.send("❌ No game is currently running.")
+        if ctx.channel.id not in self.game_sessions:
+            await ctx.send("❌ No game is currently running in this channel.")
             return
         
-        session = self.game_sessions[guild_id]
+        session = self.game_sessions[ctx.channel.id]
         
         # Check if the game is in progress
         if not session.is_in_progress:
@@ -355,13 +411,11 @@ class ActorGame(commands.Cog):
             return
         
         session.last_activity = time.time()
+        self.journal.record_activity(session)
         
-        # Get the correct term based on the category
-        item_type = "actor"
-        if session.category.lower() == "apps":
-            item_type = "app"
-        elif session.category.lower() == "food":
-            item_type = "food item"
+        # Get the wording for the category's items
+        category = category_registry.get(session.category)
+        item_type = category.noun
         
         # Send the public question to the channel without the actor name
         public_embed = discord.Embed(
@@ -377,46 +431,43 @@ class ActorGame(commands.Cog):
         
         # Now send a private DM to each OTHER player with the asker's item
         # This way everyone except the asker knows what that person needs to guess
-        confirmation_sent = False
+        # Create the response embed for others
+        response_embed = discord.Embed(
+            title="❓ Help With Question",
+            description=f"**{ctx.author.display_name}** asked: {question}",
+            color=discord.Color.purple()
+        )
+        
+        response_embed.add_field(
+            name=f"Help them guess this {item_type}:",
+            value=f"**{player.actor}**",
+            inline=False
+        )
         
-        for other_player in session.players:
+        response_embed.add_field(
+            name="How to help:",
+            value="Reply to their question in the channel to give them clues without revealing the answer.",
+            inline=False
+        )
+        
+        response_embed.set_footer(text=f"Only you and others (not the asker) can see this {item_type} name")
+        
+        messages = []
+        for other_player in session.players.values():
             # Skip the player who asked the question
             if other_player.id == ctx.author.id:
                 continue
-                
+            
             # Get the Discord member object
             member = ctx.guild.get_member(other_player.id)
-            if not member:
-                continue
-                
-            # Create the response embed for others
-            response_embed = discord.Embed(
-                title="❓ Help With Question",
-                description=f"**{ctx.author.display_name}** asked: {question}",
-                color=discord.Color.purple()
-            )
-            
-            response_embed.add_field(
-                name=f"Help them guess this {item_type}:",
-                value=f"**{player.actor}**",
-                inline=False
-            )
-            
-            response_embed.add_field(
-                name="How to help:",
-                value="Reply to their question in the channel to give them clues without revealing the answer.",
-                inline=False
-            )
-            
-            response_embed.set_footer(text=f"Only you and others (not the asker) can see this {item_type} name")
-            
-            # Send the DM to the other player
-            try:
-                await member.send(embed=response_embed)
-                confirmation_sent = True
-            except discord.Forbidden:
-                # If DMs are disabled, warn in the channel
-                await ctx.send(f"⚠️ {member.mention} has DMs disabled. Please enable DMs from server members to receive secret info.")
+            if member:
+                messages.append((member, {"embed": response_embed}))
+        
+        result = await broadcast_dms(messages)
+        confirmation_sent = bool(result.sent)
+        if result.undelivered:
+            # If DMs are disabled, warn in the channel once for everyone
+            await ctx.send(result.failure_summary())
         
         # Send a confirmation to the asker that their question has been sent
         if confirmation_sent:
@@ -444,22 +495,19 @@ class ActorGame(commands.Cog):
         guild_id = ctx.guild.id
         
         # Check if a game is running
-        if guild_id not in self.game_sessions:
-            await ctx.send("❌ No game is currently running.")
+        if ctx.channel.id not in self.game_sessions:
+            await ctx.send("❌ No game is currently running in this channel.")
             return
         
-        session = self.game_sessions[guild_id]
+        session = self.game_sessions[ctx.channel.id]
         
-        # Get the correct term based on the category
-        item_type = "actor"
-        if session.category.lower() == "apps":
-            item_type = "app"
-        elif session.category.lower() == "food":
-            item_type = "food item"
+        # Get the wording for the category's items
+        category = category_registry.get(session.category)
+        item_type = category.noun
         
         # Check if the game is in progress
         if not session.is_in_progress:
-            await ctx.send(f"❌ The game hasn't started yet. Wait for the host to assign {item_type}s.")
+            await ctx.send(f"❌ The game hasn't started yet. Wait for the host to assign {category.plural}.")
             return
         
         # Check if the user is in the game
@@ -483,12 +531,32 @@ class ActorGame(commands.Cog):
             await ctx.send(f"❌ You've used all your {config.GUESS_LIMIT} guess attempts! Your {item_type} was **{player.actor}**.")
             return
         
+        # Match against the category's name index, so case, accents, punctuation, aliases and small typos are forgiven
+        name_index = await actor_catalog.name_index(session.category)
+        is_correct = name_index.matches(actor_name, player.actor)
+        
+        if not is_correct and name_index.lookup(actor_name) is None:
+            # Not a name we know; offer close ones instead of using up a guess. Whether the retry is
+            # free depends only on the unfiltered matches, and the player's own item is never shown,
+            # so the reply gives away nothing about how close the guess was to it.
+            closest = [name for name, _ in name_index.closest(actor_name)]
+            if closest:
+                suggestions = [name for name in closest if compact(name) != compact(player.actor)]
+                await ctx.send(
+                    f"🤔 I don't know **{actor_name}**. "
+                    + ("Did you mean: " + ", ".join(f"**{name}**" for name in suggestions) + "?" if suggestions
+                       else "Check the spelling and try again.")
+                    + "\nThis didn't count as a guess."
+                )
+                return
+        
         session.last_activity = time.time()
         player.guess_count += 1
         
-        # Check if the guess is correct (case-insensitive)
-        if actor_name.lower() == player.actor.lower():
-            player.has_guessed_correctly = True
+        if is_correct:
+            session.record_correct_guess(player)
+            self.journal.record_guess(session, player)
+            self.stats.record_guess(session, player, True)
             
             embed = discord.Embed(
                 title="🎉 Correct Guess!",
@@ -497,17 +565,16 @@ class ActorGame(commands.Cog):
             )
             
             # Check if all players have guessed their items
-            all_guessed = all(p.has_guessed_correctly for p in session.players)
-            if all_guessed:
+            if session.all_guessed_correctly():
                 embed.add_field(
                     name="Game Complete!",
-                    value=f"All players have correctly guessed their {item_type}s. The game is now over!",
+                    value=f"All players have correctly guessed their {category.plural}. The game is now over!",
                     inline=False
                 )
                 # End the game
-                del self.game_sessions[guild_id]
+                self._end_session(ctx.channel.id, "completed")
             else:
-                remaining = sum(1 for p in session.players if not p.has_guessed_correctly)
+                remaining = session.remaining_players
                 embed.add_field(
                     name="Status",
                     value=f"{remaining} players still need to guess their {item_type}.",
@@ -516,9 +583,11 @@ class ActorGame(commands.Cog):
             
             await ctx.send(embed=embed)
             logger.info(f"Player {ctx.author.id} correctly guessed their {item_type} in guild {guild_id}")
-            
+        
         else:
             # Incorrect guess
+            self.journal.record_guess(session, player)
+            self.stats.record_guess(session, player, False)
             guesses_left = config.GUESS_LIMIT - player.guess_count
             
             embed = discord.Embed(
@@ -549,23 +618,19 @@ class ActorGame(commands.Cog):
         guild_id = ctx.guild.id
         
         # Check if a game is running
-        if guild_id not in self.game_sessions:
-            await ctx.send("❌ No game is currently running.")
+        if ctx.channel.id not in self.game_sessions:
+            await ctx.send("❌ No game is currently running in this channel.")
             return
         
-        session = self.game_sessions[guild_id]
+        session = self.game_sessions[ctx.channel.id]
         
         # Check if the command was issued by the host or by someone with admin permissions
         if ctx.author.id != session.host_id and not ctx.author.guild_permissions.administrator:
             await ctx.send("❌ Only the game host or an administrator can end the game.")
             return
         
-        # Get the correct term based on the category
-        item_type = "actor"
-        if session.category.lower() == "apps":
-            item_type = "app"
-        elif session.category.lower() == "food":
-            item_type = "food item"
+        # Get the category's display names
+        category = category_registry.get(session.category)
         
         # Build a summary of the game
         embed = discord.Embed(
@@ -576,7 +641,7 @@ class ActorGame(commands.Cog):
         
         # List all players and their items
         players_summary = []
-        for player in session.players:
+        for player in session.players.values():
             member = ctx.guild.get_member(player.id)
             if member:
                 status = "✅ Guessed correctly" if player.has_guessed_correctly else "❌ Didn't guess"
@@ -584,16 +649,16 @@ class ActorGame(commands.Cog):
         
         if players_summary:
             embed.add_field(
-                name=f"Players & {item_type.capitalize()}s",
+                name=f"Players & {category.plural.capitalize()}",
                 value="\n".join(players_summary),
                 inline=False
             )
         
         # End the game and remove from sessions
-        del self.game_sessions[guild_id]
+        self._end_session(ctx.channel.id, "ended")
         
         await ctx.send(embed=embed)
-        logger.info(f"Game ended in guild {guild_id} by user {ctx.author.id}")
+        logger.info(f"Game ended in channel {ctx.channel.id} of guild {guild_id} by user {ctx.author.id}")
     
     @commands.command(name="gamestatus")
     async def game_status(self, ctx):
@@ -601,23 +666,19 @@ class ActorGame(commands.Cog):
         guild_id = ctx.guild.id
         
         # Check if a game is running
-        if guild_id not in self.game_sessions:
-            await ctx.send("❌ No game is currently running.")
+        if ctx.channel.id not in self.game_sessions:
+            await ctx.send("❌ No game is currently running in this channel.")
             return
         
-        session = self.game_sessions[guild_id]
+        session = self.game_sessions[ctx.channel.id]
+        
+        # Get the category's display names
+        category = category_registry.get(session.category)
         
-        # Get the correct term based on the category
-        item_type = "actor"
-        if session.category.lower() == "apps":
-            item_type = "app"
-        elif session.category.lower() == "food":
-            item_type = "food item"
-            
         # Create an embed with game status
         embed = discord.Embed(
             title="🎭 Game Status",
-            description=f"Category: **{session.category}**",
+            description=f"Category: **{category.name}**",
             color=discord.Color.blue()
         )
         
@@ -630,13 +691,13 @@ class ActorGame(commands.Cog):
         )
         
         # Add game phase
-        phase = f"Assigning {item_type.capitalize()}s" if not session.is_in_progress else "Guessing Phase"
+        phase = f"Assigning {category.plural.capitalize()}" if not session.is_in_progress else "Guessing Phase"
         embed.add_field(name="Phase", value=phase, inline=True)
         
         # List players and their status
         if session.is_in_progress:
             player_list = []
-            for player in session.players:
+            for player in session.players.values():
                 member = ctx.guild.get_member(player.id)
                 if member:
                     status = "✅ Guessed correctly" if player.has_guessed_correctly else f"❓ ({config.GUESS_LIMIT - player.guess_count} guesses left)"
@@ -649,7 +710,7 @@ class ActorGame(commands.Cog):
             )
         else:
             # If game hasn't started, just list the players
-            player_mentions = [f"<@{player.id}>" for player in session.players]
+            player_mentions = [f"<@{player.id}>" for player in session.players.values()]
             embed.add_field(
                 name=f"Players ({len(session.players)})",
                 value="\n".join(player_mentions) or "No players",
@@ -657,6 +718,52 @@ class ActorGame(commands.Cog):
             )
         
         await ctx.send(embed=embed)
+    
+    @commands.command(name="leaderboard", aliases=["lb"])
+    async def leaderboard(self, ctx):
+        """Show this server's top 'Guess It' players."""
+        rows = await self.stats.leaderboard(ctx.guild.id)
+        
+        embed = discord.Embed(
+            title="🏆 Guess It Leaderboard",
+            color=discord.Color.gold()
+        )
+        
+        if not rows:
+            embed.description = "No wins yet. Start a game with `=startgame`!"
+        else:
+            medals = ["🥇", "🥈", "🥉"]
+            lines = []
+            for position, row in enumerate(rows):
+                prefix = medals[position] if position < len(medals) else f"**{position + 1}.**"
+                lines.append(
+                    f"{prefix} {row['name']} - {row['wins']} wins, "
+                    f"{row['avg_guesses']} guesses per win, best streak {row['best_streak']}"
+                )
+            embed.description = "\n".join(lines)
+        
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="mystats")
+    async def my_stats(self, ctx):
+        """Show your 'Guess It' stats in this server."""
+        stats = await self.stats.player_stats(ctx.guild.id, ctx.author.id)
+        if stats is None:
+            await ctx.send("❌ You haven't played any games here yet.")
+            return
+        
+        embed = discord.Embed(
+            title=f"📊 Stats for {ctx.author.display_name}",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Games", value=str(stats["games"]), inline=True)
+        embed.add_field(name="Wins", value=str(stats["wins"]), inline=True)
+        embed.add_field(name="Rank", value=f"#{stats['rank']}" if stats["rank"] else "-", inline=True)
+        embed.add_field(name="Guesses per Win", value=str(stats["avg_guesses"] or "-"), inline=True)
+        embed.add_field(name="Current Streak", value=str(stats["streak"]), inline=True)
+        embed.add_field(name="Best Streak", value=str(stats["best_streak"]), inline=True)
+        
+        await ctx.send(embed=embed)
 
 async def setup(bot):
     """Setup function to add the cog to the bot."""
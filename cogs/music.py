@@ -11,6 +11,7 @@ import os
 from typing import Dict, List, Optional
 from config import Config
 from utils.music_utils import get_lyrics, create_queue_embed, format_duration
+from utils.lyrics_paginator import LyricsPaginator, paginate_lyrics
 
 logger = logging.getLogger("discord_bot.music")
 
@@ -589,30 +590,19 @@ class Music(commands.Cog):
                 await ctx.send(f"Lyrics for **{song_name}** not found.")
                 return
             
-            # Split lyrics into chunks if too long
-            max_chars = 4000  # Discord embed description limit is 4096
-            chunks = []
+            # Show the lyrics in one message with page buttons
+            pages = paginate_lyrics(lyrics)
             
-            for i in range(0, len(lyrics), max_chars):
-                chunks.append(lyrics[i:i + max_chars])
-            
-            # Send the first chunk with song info
-            embed = discord.Embed(
-                title=f"Lyrics for {song_name}",
-                description=chunks[0],
-                color=discord.Color.blue()
-            )
-            
-            messages = [await ctx.send(embed=embed)]
-            
-            # Send additional chunks if needed
-            for i, chunk in enumerate(chunks[1:], 1):
+            def make_embed(page, index, total):
                 embed = discord.Embed(
-                    title=f"Lyrics for {song_name} (continued {i}/{len(chunks)-1})",
-                    description=chunk,
+                    title=f"Lyrics for {song_name}",
+                    description=page,
                     color=discord.Color.blue()
                 )
-                messages.append(await ctx.send(embed=embed))
+                embed.set_footer(text=f"Page {index + 1}/{total}")
+                return embed
+            
+            await LyricsPaginator(pages, make_embed, author_id=ctx.author.id).send(ctx)
             
         except Exception as e:
             logger.error(f"Error fetching lyrics: {e}")
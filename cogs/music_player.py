@@ -21,7 +21,9 @@ from spotipy.oauth2 import SpotifyClientCredentials
 
 import config
 from utils.music_utils import MusicQueue, Song
-from utils.lyrics_fetcher import fetch_lyrics
+from utils.lyrics_fetcher import fetch_lyrics, lyrics_prefetcher
+from utils.lyrics_paginator import LyricsPaginator, paginate_lyrics
+from utils.deadline_scheduler import DeadlineScheduler
 
 logger = logging.getLogger('discord_bot.music_player')
 
@@ -71,7 +73,7 @@ class YTDLSource(discord.PCMVolumeTransformer):
         self.uploader = data.get('uploader')
     
     @classmethod
-    async def create_source(cls, search: str, *, loop=None):
+    async def create_source(cls, search: str, *, loop=None, requester_id: Optional[int] = None):
         """Create a source from a search query or URL."""
         loop = loop or asyncio.get_event_loop()
         
@@ -97,7 +99,8 @@ class YTDLSource(discord.PCMVolumeTransformer):
             webpage_url=data.get('webpage_url', search),
             thumbnail=data.get('thumbnail'),
             uploader=data.get('uploader', 'Unknown'),
-            is_spotify=False
+            is_spotify=False,
+            requester_id=requester_id
         )
         
         return song
@@ -250,6 +253,8 @@ class MusicPlayer(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.music_queues: Dict[int, MusicQueue] = {}  # {guild_id: MusicQueue}
+        # Leaves voice channels that have had nothing to play for MUSIC_IDLE_TIMEOUT
+        self.idle_disconnect = DeadlineScheduler("music-idle", self._leave_if_idle)
         self.setup_spotify()
     
     def setup_spotify(self):
@@ -259,6 +264,48 @@ class MusicPlayer(commands.Cog):
         self.spotify = None
         return False
     
+    def cog_unload(self):
+        """Cleanup when the cog is unloaded."""
+        lyrics_prefetcher.cancel_all()
+        self.idle_disconnect.stop()
+    
+    async def _leave_if_idle(self, guild_id: int) -> None:
+        """Disconnect from voice in a guild whose queue ran out MUSIC_IDLE_TIMEOUT ago."""
+        guild = self.bot.get_guild(guild_id)
+        voice_client = guild.voice_client if guild else None
+        if voice_client is None or not voice_client.is_connected():
+            return
+        if voice_client.is_playing() or voice_client.is_paused():
+            return
+        
+        await voice_client.disconnect()
+        logger.info(f"Left voice channel in guild {guild_id} after {config.MUSIC_IDLE_TIMEOUT}s idle")
+    
+    @staticmethod
+    def _lyrics_query(song: Song) -> str:
+        """Build a lyrics search query from a song's title and uploader."""
+        # Remove any "(Official Video)" or similar text from the title
+        title = song.title
+        title = re.sub(r'\([^)]*\)|ft\..*|feat\..*|-\s+[\w\s]+', '', title)
+        query = title.strip()
+        
+        # Add artist name to query if available for better results
+        if song.uploader and song.uploader.lower() != "unknown":
+            query += f" {song.uploader}"
+        
+        return query
+    
+    def _prefetch_lyrics(self, queue: MusicQueue, song: Song) -> None:
+        """Warm the lyrics cache for the song that just started and the one after it."""
+        if not config.LYRICS_PREFETCH or not config.GENIUS_API_KEY:
+            return
+        
+        lyrics_prefetcher.schedule(self._lyrics_query(song), config.GENIUS_API_KEY)
+        
+        upcoming = queue.current_song
+        if upcoming is not None and upcoming is not song:
+            lyrics_prefetcher.schedule(self._lyrics_query(upcoming), config.GENIUS_API_KEY)
+    
     def get_queue(self, guild_id: int) -> MusicQueue:
         """Get or create a MusicQueue for a guild."""
         if guild_id not in self.music_queues:
@@ -303,6 +350,7 @@ class MusicPlayer(commands.Cog):
         if ctx.guild.id in self.music_queues:
             self.music_queues[ctx.guild.id].clear()
         
+        self.idle_disconnect.cancel(ctx.guild.id)
         await ctx.voice_client.disconnect()
         await ctx.send("👋 Disconnected from voice channel!")
         logger.info(f"Bot left voice channel in guild {ctx.guild.id}")
@@ -433,7 +481,7 @@ class MusicPlayer(commands.Cog):
                 
                 await ctx.send(f"🔍 Searching for: {search_query}")
                 # Now search YouTube with this query
-                song = await YTDLSource.create_source(search_query, loop=self.bot.loop)
+                song = await YTDLSource.create_source(search_query, loop=self.bot.loop, requester_id=ctx.author.id)
                 
                 # Add the song to the queue
                 queue.add(song)
@@ -469,7 +517,7 @@ class MusicPlayer(commands.Cog):
                 
                 # Fall back to treating the whole URL as a search term
                 try:
-                    song = await YTDLSource.create_source(query, loop=self.bot.loop)
+                    song = await YTDLSource.create_source(query, loop=self.bot.loop, requester_id=ctx.author.id)
                     queue.add(song)
                     await ctx.send(f"✅ Added to queue: {song.title}")
                     
@@ -487,7 +535,7 @@ class MusicPlayer(commands.Cog):
         
         try:
             # Get the song information
-            song = await YTDLSource.create_source(query, loop=self.bot.loop)
+            song = await YTDLSource.create_source(query, loop=self.bot.loop, requester_id=ctx.author.id)
             
             # Add the song to the queue
             queue.add(song)
@@ -534,6 +582,7 @@ class MusicPlayer(commands.Cog):
         
         if queue.is_empty():
             logger.debug("Queue is empty")
+            self.idle_disconnect.schedule_in(ctx.guild.id, config.MUSIC_IDLE_TIMEOUT)
             await ctx.send("🎵 Queue is empty. Use `=play` to add songs!")
             return
         
@@ -545,6 +594,7 @@ class MusicPlayer(commands.Cog):
             return
             
         logger.debug(f"Got next song: {song.title}")
+        self.idle_disconnect.cancel(ctx.guild.id)
         
         try:
             # Handle Spotify songs by searching YouTube
@@ -650,6 +700,9 @@ class MusicPlayer(commands.Cog):
                 await ctx.send(embed=embed)
                 logger.info(f"Now playing: {song.title}")
                 
+                # Optionally warm the lyrics cache so =lyrics answers immediately
+                self._prefetch_lyrics(queue, song)
+                
             except Exception as e:
                 logger.error(f"Error starting playback: {e}")
                 await ctx.send(f"❌ Error starting playback: {str(e)}")
@@ -682,6 +735,7 @@ class MusicPlayer(commands.Cog):
             if not queue.is_empty():
                 await self.play_next_song(ctx)
             else:
+                self.idle_disconnect.schedule_in(ctx.guild.id, config.MUSIC_IDLE_TIMEOUT)
                 await ctx.send("🎵 Queue finished. Add more songs with `=play`!")
         except Exception as e:
             logger.error(f"Error in song_finished callback: {e}")
@@ -838,14 +892,7 @@ class MusicPlayer(commands.Cog):
                 await ctx.send("❌ No song is currently playing. Please provide a song name.")
                 return
             
-            # Remove any "(Official Video)" or similar text from the title
-            title = current_song.title
-            title = re.sub(r'\([^)]*\)|ft\..*|feat\..*|-\s+[\w\s]+', '', title)
-            query = title.strip()
-            
-            # Add artist name to query if available for better results
-            if hasattr(current_song, 'uploader') and current_song.uploader and current_song.uploader.lower() != "unknown":
-                query += f" {current_song.uploader}"
+            query = self._lyrics_query(current_song)
         
         # Check if Genius API key is provided
         if not config.GENIUS_API_KEY:
@@ -864,10 +911,10 @@ class MusicPlayer(commands.Cog):
                     if "API key required" in error_message:
                         await ctx.send("⚠️ Genius API key is required for lyrics functionality. Please contact the bot administrator.")
                     else:
-                        await ctx.send(f"❌ Couldn't find lyrics for: `{query}`\nReason: {lyrics_data.get('lyrics', 'No results found')}")
+                        reason = lyrics_data.get('lyrics') or lyrics_data.get('error') or 'No results found'
+                        await ctx.send(f"❌ Couldn't find lyrics for: `{query}`\nReason: {reason}")
                     return
                 
-                # Create embeds for the lyrics (Discord has a 2000 character limit per embed)
                 title = lyrics_data.get('title', 'Unknown')
                 artist = lyrics_data.get('artist', 'Unknown')
                 lyrics = lyrics_data.get('lyrics', 'No lyrics found')
@@ -876,53 +923,25 @@ class MusicPlayer(commands.Cog):
                 thumbnail = lyrics_data.get('thumbnail', None)
                 alternatives = lyrics_data.get('alternatives', [])
                 
-                # Split lyrics into chunks of 1800 characters or less (leaving room for formatting)
-                # Try to split on double newlines to keep stanzas together
-                chunks = []
-                current_chunk = ""
-                
-                for line in lyrics.split('\n'):
-                    if len(current_chunk) + len(line) + 1 > 1800:
-                        chunks.append(current_chunk)
-                        current_chunk = line
-                    else:
-                        if current_chunk:
-                            current_chunk += '\n' + line
-                        else:
-                            current_chunk = line
-                
-                if current_chunk:
-                    chunks.append(current_chunk)
-                
-                if not chunks:
-                    chunks = ["No lyrics found"]
-                
-                # Send the first embed with title and artist
-                first_embed = discord.Embed(
-                    title=f"📝 Lyrics: {title}",
-                    description=chunks[0],
-                    color=discord.Color.purple(),
-                    url=url
-                )
-                first_embed.set_author(name=f"Artist: {artist}")
-                
-                if thumbnail:
-                    first_embed.set_thumbnail(url=thumbnail)
-                
-                if source:
-                    first_embed.set_footer(text=f"Source: {source} | Page 1/{len(chunks)}")
-                
-                await ctx.send(embed=first_embed)
+                # Split on stanza boundaries and show all pages in one message with page buttons
+                pages = paginate_lyrics(lyrics)
                 
-                # Send the rest of the lyrics in separate embeds
-                for i, chunk in enumerate(chunks[1:], 2):
+                def make_embed(page: str, index: int, total: int) -> discord.Embed:
                     embed = discord.Embed(
-                        description=chunk,
+                        title=f"📝 Lyrics: {title}",
+                        description=page,
                         color=discord.Color.purple(),
                         url=url
                     )
-                    embed.set_footer(text=f"Source: {source} | Page {i}/{len(chunks)}")
-                    await ctx.send(embed=embed)
+                    embed.set_author(name=f"Artist: {artist}")
+                    
+                    if thumbnail:
+                        embed.set_thumbnail(url=thumbnail)
+                    
+                    embed.set_footer(text=f"Source: {source} | Page {index + 1}/{total}")
+                    return embed
+                
+                await LyricsPaginator(pages, make_embed, author_id=ctx.author.id).send(ctx)
                 
                 # If there are alternative matches, send them as a suggestion
                 if alternatives and len(alternatives) > 0:
@@ -1020,6 +1039,129 @@ class MusicPlayer(commands.Cog):
             queue.current_index = 0
         
         await ctx.send("🧹 Queue has been cleared.")
+    
+    @staticmethod
+    def _parse_positions(text: str, queue_length: int) -> Optional[Tuple[int, int]]:
+        """Parse a 1-based position ("5") or inclusive range ("5-20") into a 0-based slice."""
+        match = re.fullmatch(r'\s*(\d+)\s*(?:-\s*(\d+)\s*)?', text)
+        if not match:
+            return None
+        
+        first = int(match.group(1))
+        last = int(match.group(2)) if match.group(2) else first
+        if first > last:
+            first, last = last, first
+        
+        if first < 1 or last > queue_length:
+            return None
+        
+        return first - 1, last
+    
+    @commands.command(name="remove", aliases=["rm"])
+    async def remove_songs(self, ctx, *, positions: str = None):
+        """
+        Remove a song or a range of songs from the queue.
+        
+        Usage:
+        =remove 5 - Remove the song at position 5
+        =remove 5-20 - Remove songs 5 through 20
+        """
+        queue = self.get_queue(ctx.guild.id)
+        
+        if queue.is_empty():
+            await ctx.send("📭 The queue is empty.")
+            return
+        
+        if positions is None:
+            await ctx.send("❌ Please provide a position or range, e.g. `=remove 5` or `=remove 5-20`.")
+            return
+        
+        span = self._parse_positions(positions, len(queue.songs))
+        if span is None:
+            await ctx.send(f"❌ Invalid position or range. The queue has {len(queue.songs)} songs.")
+            return
+        
+        removed = queue.remove_range(*span)
+        
+        if len(removed) == 1:
+            await ctx.send(f"🗑️ Removed **{removed[0].title}** from the queue.")
+        else:
+            await ctx.send(f"🗑️ Removed {len(removed)} songs (positions {span[0] + 1}-{span[1]}) from the queue.")
+    
+    @commands.command(name="move", aliases=["mv"])
+    async def move_song(self, ctx, source: int, destination: int):
+        """
+        Move a song to a different position in the queue.
+        
+        Usage: =move <from> <to>
+        Example: =move 30 2
+        """
+        queue = self.get_queue(ctx.guild.id)
+        
+        song = queue.move(source - 1, destination - 1)
+        if song is None:
+            await ctx.send(f"❌ Positions must be between 1 and {len(queue.songs)}.")
+            return
+        
+        await ctx.send(f"↕️ Moved **{song.title}** to position {destination}.")
+    
+    @commands.command(name="dedupe", aliases=["removedupes"])
+    async def dedupe_queue(self, ctx):
+        """Remove duplicate songs from the queue, keeping the first copy of each."""
+        queue = self.get_queue(ctx.guild.id)
+        
+        if queue.is_empty():
+            await ctx.send("📭 The queue is empty.")
+            return
+        
+        removed = queue.dedupe()
+        if not removed:
+            await ctx.send("✅ No duplicate songs in the queue.")
+            return
+        
+        await ctx.send(f"🧹 Removed {len(removed)} duplicate song{'s' if len(removed) != 1 else ''} from the queue.")
+    
+    @commands.command(name="removeuser")
+    async def remove_user_songs(self, ctx, member: discord.Member):
+        """
+        Remove every song queued by a user.
+        
+        Usage: =removeuser @user
+        """
+        queue = self.get_queue(ctx.guild.id)
+        
+        removed = queue.remove_where(lambda song: song.requester_id == member.id)
+        if not removed:
+            await ctx.send(f"❌ No songs in the queue were added by {member.display_name}.")
+            return
+        
+        await ctx.send(f"🗑️ Removed {len(removed)} song{'s' if len(removed) != 1 else ''} added by {member.display_name}.")
+    
+    @commands.command(name="skipto", aliases=["jump"])
+    async def skip_to(self, ctx, position: int):
+        """
+        Skip directly to a song in the queue.
+        
+        Usage: =skipto <position>
+        """
+        if ctx.voice_client is None:
+            await ctx.send("❌ I'm not connected to a voice channel.")
+            return
+        
+        queue = self.get_queue(ctx.guild.id)
+        
+        song = queue.skip_to(position - 1)
+        if song is None:
+            await ctx.send(f"❌ Position must be between 1 and {len(queue.songs)}.")
+            return
+        
+        await ctx.send(f"⏭️ Skipping to **{song.title}** (position {position}).")
+        
+        # Stopping triggers the after callback, which plays the song at the new index
+        if ctx.voice_client.is_playing() or ctx.voice_client.is_paused():
+            ctx.voice_client.stop()
+        else:
+            await self.play_next_song(ctx)
 
 async def setup(bot):
     """Setup function to add the cog to the bot."""
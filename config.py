@@ -8,14 +8,35 @@ MIN_PLAYERS = 2
 MAX_PLAYERS = 10
 GAME_TIMEOUT = 300  # 5 minutes of inactivity
 GUESS_LIMIT = 3     # Number of guess attempts per player
+MAX_GAMES_PER_GUILD = int(os.getenv("MAX_GAMES_PER_GUILD", "25"))  # Parallel games per server (one per channel)
+MAX_ACTIVE_GAMES = int(os.getenv("MAX_ACTIVE_GAMES", "1000"))  # Parallel games across all servers
+STATS_DB_PATH = os.getenv("STATS_DB_PATH", "data/game_stats.db")  # Game history, leaderboard and item difficulty
 
-# Actor game categories
-CATEGORIES = ["Hollywood", "Bollywood", "Apps", "Food"]
+# Dashboard settings
+STATUS_DB_PATH = os.getenv("STATUS_DB_PATH", "data/bot_status.db")  # Status snapshots shared with the dashboard workers
+STATUS_INTERVAL = 30  # Seconds between status snapshots
+STATUS_STALE_AFTER = 90  # Show the bot as offline when the latest snapshot is older than this
+STATUS_STREAM_POLL = 1.0  # Seconds between snapshot checks in each live status stream
+STATUS_STREAM_MAX_AGE = 300  # Seconds before a live status stream is closed and the browser reconnects
+STATUS_STREAM_RETRY_MS = 3000  # Browser reconnect delay after a stream ends
+STATUS_STREAM_MAX_CLIENTS = int(os.getenv("STATUS_STREAM_MAX_CLIENTS", "4"))  # Live streams per dashboard process; keep below gunicorn's --threads
+
+# Admin API served from the bot process (JSON only; the dashboard pages stay in Flask)
+ADMIN_API_ENABLED = os.getenv("ADMIN_API_ENABLED", "false").lower() in ("1", "true", "yes")
+ADMIN_API_HOST = os.getenv("ADMIN_API_HOST", "127.0.0.1")
+ADMIN_API_PORT = int(os.getenv("ADMIN_API_PORT", "8081"))
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")  # Required unless the API only listens on localhost
+
+# Actor game categories: metadata in data/categories.json, extra item lists in data/categories/
+ACTOR_BACKEND = os.getenv("ACTOR_BACKEND", "json")  # "json" (data/actors.json) or "sqlite" for large categories
+ACTOR_DB_PATH = os.getenv("ACTOR_DB_PATH", "data/actors.db")
 
 # Music bot settings
 DEFAULT_VOLUME = 0.5  # 50%
 MAX_QUEUE_SIZE = 100
+MUSIC_IDLE_TIMEOUT = 300  # Leave the voice channel after 5 minutes with nothing to play
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
 SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID", "")
 SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET", "")
 GENIUS_API_KEY = os.getenv("GENIUS_API_KEY", "")
+LYRICS_PREFETCH = os.getenv("LYRICS_PREFETCH", "false").lower() in ("1", "true", "yes")  # Fetch lyrics for the current and next song in the background
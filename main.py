@@ -6,7 +6,13 @@ import time
 from discord.ext import commands
 import config
 from threading import Thread
-from app import app, update_bot_status
+from app import app, build_bot_status, update_bot_status
+from utils.http_client import http_client
+from utils.lyrics_store import lyrics_store
+from utils.lyrics_fetcher import lyrics_cache
+from utils.actor_catalog import actor_catalog
+from utils.status_store import status_store
+from utils.admin_server import AdminServer
 from datetime import datetime, timedelta
 
 # Setup logging
@@ -20,7 +26,41 @@ intents.message_content = True
 intents.members = True
 intents.guilds = True
 
-bot = commands.Bot(command_prefix=config.PREFIX, intents=intents, help_command=None)
+class HarmoniaBot(commands.Bot):
+    """Bot subclass that owns resources shared across cogs for the bot's lifetime."""
+    
+    admin_server = None
+    
+    async def setup_hook(self):
+        """Set up shared resources before the bot connects to Discord."""
+        # Pooled HTTP session for all outbound requests
+        await http_client.start()
+        
+        # Optional JSON admin API on the bot's own event loop
+        if config.ADMIN_API_ENABLED:
+            self.admin_server = AdminServer(self, config.ADMIN_API_HOST, config.ADMIN_API_PORT,
+                                            config.ADMIN_API_TOKEN, status=lambda: build_bot_status(self))
+            try:
+                await self.admin_server.start()
+            except OSError as e:
+                logger.error(f"Could not start the admin API: {e}")
+    
+    async def close(self):
+        """Release shared resources when the bot shuts down."""
+        if self.admin_server is not None:
+            await self.admin_server.stop()
+        await http_client.close()
+        # The sweeper task belongs to this loop; the next run starts its own
+        lyrics_cache.stop_sweeper()
+        # Write out any buffered lyrics before exiting
+        await lyrics_store.close()
+        # Write out actor edits still waiting for the write-behind timer
+        await asyncio.to_thread(actor_catalog.flush)
+        # Show the bot as offline on the dashboard straight away
+        await publish_status(None)
+        await super().close()
+
+bot = HarmoniaBot(command_prefix=config.PREFIX, intents=intents, help_command=None)
 
 # Track when the bot started
 bot.start_time = None
@@ -43,18 +83,26 @@ async def on_ready():
     await bot.change_presence(activity=activity)
     
     # Update web dashboard status
-    update_bot_status(bot)
+    await publish_status(bot)
     
     # Schedule periodic status updates
     asyncio.create_task(update_status_periodically())
     
     print(f'Bot is ready! Logged in as {bot.user.name}')
 
+async def publish_status(bot):
+    """Refresh the bot status and publish it for the dashboard processes."""
+    status = update_bot_status(bot)
+    try:
+        await asyncio.to_thread(status_store.publish, status)
+    except Exception as e:
+        logger.error(f"Error publishing bot status: {e}")
+
 async def update_status_periodically():
     """Update the bot status in the web dashboard periodically."""
     while True:
-        await asyncio.sleep(30)  # Update every 30 seconds
-        update_bot_status(bot)
+        await asyncio.sleep(config.STATUS_INTERVAL)
+        await publish_status(bot)
         logger.debug("Updated bot status in web dashboard")
 
 async def load_cogs():
@@ -89,7 +137,7 @@ async def on_command_error(ctx, error):
     if isinstance(error, commands.MissingPermissions):
         await ctx.send("❌ You don't have permission to use this command.")
         return
-
+    
     # Log other errors
     logger.error(f'Command error in {ctx.command}: {error}')
     await ctx.send(f"❌ An error occurred: {str(error)}")
@@ -200,7 +248,7 @@ async def help_command(ctx, command_name=None):
         )
         
         # Guess It game commands
-        game_commands = "`startgame`, `join`, `question`, `guess`, `endgame`, `gamestatus`"
+        game_commands = "`startgame`, `join`, `question`, `guess`, `endgame`, `gamestatus`, `leaderboard`, `mystats`"
         embed.add_field(
             name="🎭 Guess It Game Commands",
             value=game_commands,
@@ -223,7 +271,7 @@ async def help_command(ctx, command_name=None):
         )
         
         embed.set_footer(text=f"Bot made with discord.py | Prefix: {config.PREFIX}")
-        
+    
     else:
         # Help for specific command
         command = bot.get_command(command_name)
@@ -245,11 +293,6 @@ async def help_command(ctx, command_name=None):
     
     await ctx.send(embed=embed)
 
-# Add Flask's context processor to provide current time to templates
-@app.context_processor
-def inject_now():
-    return {'now': datetime.now()}
-
 def start_flask(host='0.0.0.0', port=5000):
     """Start the Flask web server in a separate thread."""
     flask_thread = Thread(target=lambda: app.run(host=host, port=port, debug=False, use_reloader=False))
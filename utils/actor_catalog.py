@@ -0,0 +1,482 @@
+import json
+import os
+import logging
+import threading
+import time
+import atexit
+import asyncio
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.category_registry import category_registry
+from utils.name_matcher import NameIndex
+
+logger = logging.getLogger("discord_bot.actor_catalog")
+
+DEFAULT_DATA_FILE = "data/actors.json"
+
+# Written to the data file when it doesn't exist yet
+DEFAULT_ACTORS: Dict[str, List[str]] = {
+    "hollywood": [
+        "Tom Hanks", "Leonardo DiCaprio", "Brad Pitt", "Jennifer Lawrence",
+        "Meryl Streep", "Denzel Washington", "Robert Downey Jr.", "Scarlett Johansson",
+        "Johnny Depp", "Will Smith", "Emma Stone", "Chris Hemsworth",
+        "Ryan Reynolds", "Dwayne Johnson", "Anne Hathaway", "Chris Evans",
+        "Morgan Freeman", "Sandra Bullock", "Tom Cruise", "Julia Roberts",
+        "Samuel L. Jackson", "Angelina Jolie", "Hugh Jackman", "Jennifer Aniston",
+        "Chris Pratt", "Matt Damon", "Natalie Portman", "Benedict Cumberbatch",
+        "Keanu Reeves", "Charlize Theron"
+    ],
+    "bollywood": [
+        "Shah Rukh Khan", "Amitabh Bachchan", "Deepika Padukone", "Aamir Khan",
+        "Priyanka Chopra", "Salman Khan", "Kareena Kapoor", "Hrithik Roshan",
+        "Aishwarya Rai", "Ranbir Kapoor", "Katrina Kaif", "Akshay Kumar",
+        "Anushka Sharma", "Ranveer Singh", "Alia Bhatt", "Shahid Kapoor",
+        "Kajol", "Ajay Devgn", "Madhuri Dixit", "Varun Dhawan",
+        "Vidya Balan", "Sanjay Dutt", "Sonam Kapoor", "John Abraham",
+        "Shraddha Kapoor", "Irrfan Khan", "Kangana Ranaut", "Anil Kapoor",
+        "Tabu", "Nawazuddin Siddiqui"
+    ],
+    "apps": [
+        "Instagram", "Facebook", "WhatsApp", "TikTok", "YouTube",
+        "Twitter", "Snapchat", "Netflix", "Spotify", "Uber",
+        "Gmail", "Google Maps", "Amazon", "Pinterest", "Zoom",
+        "Discord", "Slack", "Microsoft Teams", "Telegram", "Reddit",
+        "LinkedIn", "Twitch", "Hulu", "Disney+", "Duolingo",
+        "Candy Crush", "Minecraft", "Fortnite", "Roblox", "Among Us"
+    ],
+    "food": [
+        "Pizza", "Hamburger", "Sushi", "Chocolate", "Ice Cream",
+        "Pasta", "Taco", "Curry", "Fried Chicken", "Pancake",
+        "Donut", "French Fries", "Sandwich", "Noodles", "Steak",
+        "Salad", "Burrito", "Croissant", "Macaroni and Cheese", "Cupcake",
+        "Ramen", "Lasagna", "Cheesecake", "Waffles", "Brownies",
+        "Pho", "Popcorn", "Nachos", "Barbeque Ribs", "Butter Chicken"
+    ]
+}
+
+class ActorCatalog:
+    """
+    Process-wide, hot-reloadable view of the actor data file.
+    
+    The file is read once and then only re-read when its identity changes
+    (device, inode, modification time or size), so every reader can call
+    `ensure_loaded` freely: in the common case it costs a single stat().
+    Edits made elsewhere (the web dashboard, another process, or by hand) are
+    picked up on the next access without restarting the bot.
+    
+    Published category lists are never mutated in place; edits swap in a new
+    dict, so a list handed to a caller stays consistent while it is in use.
+    
+    Edits are applied in memory immediately and written behind: all edits made
+    within `flush_delay` seconds are saved together in one atomic write
+    (temp file, fsync, rename), so a crash never leaves a half-written file.
+    
+    Loading and editing are plain blocking code guarded by one lock, so the
+    bot's event loop (through the async methods) and WSGI threads (through
+    SyncCatalog) share the same data and never lose each other's edits.
+    """
+    
+    def __init__(self, data_file: str = DEFAULT_DATA_FILE, flush_delay: float = 1.0):
+        self.data_file = data_file
+        self.flush_delay = flush_delay
+        self._actors: Dict[str, List[str]] = {}
+        self._signature: Optional[Tuple[int, int, int, int]] = None
+        self._loaded = False
+        self._dirty = False  # In-memory edits not yet written to the file
+        self._flush_timer: Optional[threading.Timer] = None
+        self._indexes: Dict[str, Tuple[List[str], NameIndex]] = {}  # {category: (items it was built from, index)}
+        self._version = 0  # Bumped whenever new data is published (reload or edit)
+        self._lock = threading.Lock()  # Guards edits from the bot and web threads
+        self._write_lock = threading.Lock()  # Serialises file writes
+        
+        # Counters for metrics
+        self.reloads = 0
+        self.writes = 0
+    
+    def _file_signature(self) -> Optional[Tuple[int, int, int, int]]:
+        """Return (device, inode, mtime_ns, size) of the data file, or None if it doesn't exist."""
+        try:
+            st = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    @property
+    def actors(self) -> Dict[str, List[str]]:
+        """The currently loaded data, keyed by lowercase category name."""
+        return self._actors
+    
+    def is_stale(self) -> bool:
+        """Return True if the data file changed since it was last loaded."""
+        return not self._loaded or self._file_signature() != self._signature
+    
+    async def ensure_loaded(self) -> Dict[str, List[str]]:
+        """Load the data file if it hasn't been loaded yet or has changed on disk (reading runs in a thread)."""
+        if self._dirty or (self._loaded and self._file_signature() == self._signature):
+            return self._actors
+        return await asyncio.to_thread(self.load)
+    
+    def load(self) -> Dict[str, List[str]]:
+        """Load the data file if it hasn't been loaded yet or has changed on disk. Blocking; safe to call from any thread."""
+        if self._dirty:
+            # Our own edits haven't been written yet; the file is older than memory
+            return self._actors
+        
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return self._actors
+        
+        if signature is None:
+            logger.info(f"Actor database file not found. Creating default database at {self.data_file}")
+            self._write({name: list(items) for name, items in DEFAULT_ACTORS.items()})
+            return self._actors
+        
+        try:
+            # The signature was taken before reading, so a write during the read triggers another reload
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if not isinstance(data, dict):
+                raise ValueError("expected a dictionary of categories")
+        except Exception as e:
+            if self._loaded:
+                # Probably caught mid-edit; keep serving the last good copy and retry next time
+                logger.error(f"Error reloading actor database, keeping previous data: {e}")
+                return self._actors
+            
+            # Keep the unreadable file for inspection instead of silently overwriting it
+            backup = f"{self.data_file}.corrupt-{int(time.time())}"
+            logger.error(f"Error loading actor database: {e}. Moved it to {backup} and restored the defaults")
+            try:
+                os.replace(self.data_file, backup)
+            except OSError as move_error:
+                logger.error(f"Could not move unreadable actor database aside: {move_error}")
+                return self._actors
+            self._write({name: list(items) for name, items in DEFAULT_ACTORS.items()})
+            return self._actors
+        
+        actors = {
+            str(name).lower(): [str(item) for item in items]
+            for name, items in data.items()
+            if isinstance(items, list)
+        }
+        
+        with self._lock:
+            if self._dirty:
+                # Edited while we were reading; memory is newer than the file
+                return self._actors
+            self._actors = actors
+            self._version += 1
+            self._signature = signature
+            self._loaded = True
+            self.reloads += 1
+        
+        logger.info("Loaded actor database: " + ", ".join(
+            f"{len(items)} {name}" for name, items in actors.items()
+        ))
+        return self._actors
+    
+    async def version(self) -> int:
+        """Return a number that changes whenever the catalog's data changes, for cache validation."""
+        await self.ensure_loaded()
+        return self._version
+    
+    async def get_category(self, category: str) -> List[str]:
+        """
+        Return the items of a category (case-insensitive), or an empty list if it doesn't exist.
+        
+        Categories in the data file take precedence; others are read lazily
+        from their file in the category directory.
+        """
+        actors = await self.ensure_loaded()
+        items = actors.get(category.lower())
+        if items is None:
+            return await category_registry.load_items(category)
+        return items
+    
+    async def categories(self) -> List[str]:
+        """Return the names of all categories, including those in the category directory."""
+        await category_registry.refresh()
+        actors = await self.ensure_loaded()
+        names = list(actors.keys())
+        names.extend(info.key for info in category_registry.categories() if info.path and info.key not in actors)
+        return names
+    
+    async def has_category(self, category: str) -> bool:
+        """Return True if the category exists (case-insensitive)."""
+        await category_registry.refresh()
+        actors = await self.ensure_loaded()
+        return category.lower() in actors or category_registry.has_file(category)
+    
+    async def count(self, category: str) -> int:
+        """Return the number of items in a category."""
+        return len(await self.get_category(category))
+    
+    async def list_items(self, category: str, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Return a page of a category's items."""
+        items = await self.get_category(category)
+        return items[offset:] if limit is None else items[offset:offset + limit]
+    
+    async def sample(self, category: str, k: int) -> List[str]:
+        """Return up to k distinct random items from a category."""
+        items = await self.get_category(category)
+        return random.sample(items, min(k, len(items)))
+    
+    async def items_at(self, category: str, positions: Iterable[int]) -> List[str]:
+        """Return the items at the given positions of a category (positions out of range are skipped)."""
+        items = await self.get_category(category)
+        return [items[position] for position in positions if 0 <= position < len(items)]
+    
+    async def name_index(self, category: str) -> NameIndex:
+        """
+        Return the fuzzy-matching index for a category.
+        
+        Built on first use and rebuilt only after the category's list is replaced
+        (by a reload or an edit).
+        """
+        items = await self.get_category(category)
+        cached = self._indexes.get(category.lower())
+        if cached is not None and cached[0] is items:
+            return cached[1]
+        
+        index = NameIndex(items)
+        self._indexes[category.lower()] = (items, index)
+        return index
+    
+    async def add(self, category: str, name: str) -> bool:
+        """Add an item to an existing category. Returns False if the category is unknown or the item exists."""
+        return await self.add_many(category, [name]) == 1
+    
+    async def remove(self, category: str, name: str) -> bool:
+        """Remove an item from a category. Returns False if the category or item doesn't exist."""
+        return await self.remove_many(category, [name]) == 1
+    
+    async def add_many(self, category: str, names: Iterable[str]) -> int:
+        """
+        Add several items to an existing category in one edit.
+        
+        Items already in the category (or repeated in `names`) are skipped.
+        Returns the number of items added, or 0 if the category is unknown.
+        """
+        category = category.lower()
+        return self._add_items(category, names, await self._editable_base(category))
+    
+    def _add_items(self, category: str, names: Iterable[str], base: Optional[List[str]]) -> int:
+        with self._lock:
+            items = self._actors.get(category, base)
+            if items is None:
+                return 0
+            
+            seen = set(items)
+            added = []
+            for name in names:
+                if name not in seen:
+                    seen.add(name)
+                    added.append(name)
+            if not added:
+                return 0
+            
+            actors = dict(self._actors)
+            actors[category] = items + added
+            self._actors = actors
+            self._version += 1
+            self._mark_dirty()
+        
+        return len(added)
+    
+    async def remove_many(self, category: str, names: Iterable[str]) -> int:
+        """
+        Remove several items from a category in one edit.
+        
+        Returns the number of items removed, or 0 if the category is unknown.
+        """
+        category = category.lower()
+        return self._remove_items(category, names, await self._editable_base(category))
+    
+    def _remove_items(self, category: str, names: Iterable[str], base: Optional[List[str]]) -> int:
+        with self._lock:
+            items = self._actors.get(category, base)
+            if items is None:
+                return 0
+            
+            to_remove = set(names)
+            kept = [item for item in items if item not in to_remove]
+            if len(kept) == len(items):
+                return 0
+            
+            actors = dict(self._actors)
+            actors[category] = kept
+            self._actors = actors
+            self._version += 1
+            self._mark_dirty()
+        
+        return len(items) - len(kept)
+    
+    async def _editable_base(self, category: str) -> Optional[List[str]]:
+        """
+        Return the items to start an edit from when the category isn't in the data file yet.
+        
+        Edits to a category from the category directory are saved to the data
+        file, which takes precedence from then on.
+        """
+        await category_registry.refresh()
+        actors = await self.ensure_loaded()
+        if category in actors or not category_registry.has_file(category):
+            return None
+        return await category_registry.load_items(category)
+    
+    def _mark_dirty(self) -> None:
+        """Record an in-memory edit and make sure a write is scheduled. Call with the lock held."""
+        self._dirty = True
+        if self._flush_timer is None:
+            # A timer thread rather than an asyncio task, so edits made from WSGI threads get written too
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _write(self, actors: Dict[str, List[str]]) -> None:
+        """Publish new data and write it out right away (blocking)."""
+        with self._lock:
+            self._actors = actors
+            self._version += 1
+            self._loaded = True
+            self._dirty = True
+        self.flush()
+    
+    def flush(self) -> bool:
+        """
+        Write pending edits to the data file atomically. Blocking; safe to call from any thread.
+        
+        Returns True if anything was written.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty:
+                    return False
+                actors = self._actors
+                version = self._version
+            
+            tmp_path = f"{self.data_file}.tmp"
+            try:
+                directory = os.path.dirname(self.data_file) or "."
+                os.makedirs(directory, exist_ok=True)
+                
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(actors, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.data_file)
+                
+                # Make the rename itself durable
+                try:
+                    dir_fd = os.open(directory, os.O_RDONLY)
+                    try:
+                        os.fsync(dir_fd)
+                    finally:
+                        os.close(dir_fd)
+                except OSError:
+                    pass
+                
+                with self._lock:
+                    # Don't reload our own write
+                    self._signature = self._file_signature()
+                    # Edits made during the write are still pending; their timer is already set
+                    if self._version == version:
+                        self._dirty = False
+                self.writes += 1
+                logger.info("Actor database saved")
+                return True
+            
+            except Exception as e:
+                logger.error(f"Error saving actor database: {e}")
+                with self._lock:
+                    # Still dirty; retry on the next timer tick
+                    self._mark_dirty()
+                return False
+
+def create_actor_catalog(backend: Optional[str] = None):
+    """
+    Create the catalog for the configured storage backend.
+    
+    "json" (the default) keeps data/actors.json in memory; "sqlite" stores
+    the items in ACTOR_DB_PATH, migrating actors.json into it on first use.
+    """
+    import config
+    backend = (backend or config.ACTOR_BACKEND).lower()
+    if backend == "sqlite":
+        from utils.actor_sqlite import SQLiteActorCatalog
+        return SQLiteActorCatalog(config.ACTOR_DB_PATH, json_file=DEFAULT_DATA_FILE)
+    if backend != "json":
+        logger.warning(f"Unknown actor backend '{backend}', using json")
+    return ActorCatalog()
+
+class SyncCatalog:
+    """
+    Blocking access to an ActorCatalog for WSGI code (the Flask dashboard).
+    
+    Works directly on the catalog's in-memory data under its lock, with no
+    event loop: the data file is re-read with plain file I/O when its
+    signature changes, and edits join the same write-behind as the bot's.
+    """
+    
+    def __init__(self, catalog: ActorCatalog):
+        self.catalog = catalog
+    
+    def categories(self) -> List[str]:
+        category_registry.discover()
+        actors = self.catalog.load()
+        names = list(actors.keys())
+        names.extend(info.key for info in category_registry.categories() if info.path and info.key not in actors)
+        return names
+    
+    def has_category(self, category: str) -> bool:
+        category_registry.discover()
+        return category.lower() in self.catalog.load() or category_registry.has_file(category)
+    
+    def get_category(self, category: str) -> List[str]:
+        items = self.catalog.load().get(category.lower())
+        if items is None:
+            return category_registry.read_items(category)
+        return items
+    
+    def list_items(self, category: str, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        items = self.get_category(category)
+        return items[offset:] if limit is None else items[offset:offset + limit]
+    
+    def _editable_base(self, category: str) -> Optional[List[str]]:
+        category_registry.discover()
+        if category in self.catalog.load() or not category_registry.has_file(category):
+            return None
+        return category_registry.read_items(category)
+    
+    def add(self, category: str, name: str) -> bool:
+        category = category.lower()
+        return self.catalog._add_items(category, [name], self._editable_base(category)) == 1
+    
+    def remove(self, category: str, name: str) -> bool:
+        category = category.lower()
+        return self.catalog._remove_items(category, [name], self._editable_base(category)) == 1
+    
+    def version(self) -> int:
+        self.catalog.load()
+        return self.catalog._version
+
+def create_sync_catalog(catalog):
+    """Create the blocking view matching the catalog's backend."""
+    if isinstance(catalog, ActorCatalog):
+        return SyncCatalog(catalog)
+    from utils.actor_sqlite import SyncSQLiteCatalog
+    return SyncSQLiteCatalog(catalog)
+
+# Global catalog shared by the game cog and the web dashboard
+actor_catalog = create_actor_catalog()
+
+# Blocking view of the same catalog for the Flask routes
+sync_actor_catalog = create_sync_catalog(actor_catalog)
+
+# Don't lose edits still waiting for the write-behind timer
+atexit.register(actor_catalog.flush)
@@ -1,139 +1,63 @@
-import json
-import os
 import logging
-import random
-import aiofiles
-from typing import Dict, List, Optional
+from typing import List
+
+from utils.actor_catalog import actor_catalog
 
 logger = logging.getLogger("discord_bot.actor_database")
 
 class ActorDatabase:
     """
     Utility class to manage the actor database for the game.
-    Loads and provides actor data by category.
+    Provides actor data by category.
+    
+    All instances share the process-wide actor catalog, so creating one is
+    cheap and edits made through any instance are seen everywhere.
     """
     
-    def __init__(self):
-        self.actors = {"hollywood": [], "bollywood": [], "apps": [], "food": []}
-        self.data_file = "data/actors.json"
+    def __init__(self, catalog=None):
+        # ActorCatalog (JSON) or SQLiteActorCatalog, see config.ACTOR_BACKEND
+        self.catalog = catalog or actor_catalog
     
     async def load_actors(self) -> None:
         """
-        Load actors from the JSON data file.
-        If the file doesn't exist, create it with default data.
+        Make sure the actor data is loaded.
+        The JSON file is only re-read if it changed since the last load;
+        if it doesn't exist, it is created with default data.
+        The SQLite backend opens the database, migrating actors.json on first use.
         """
-        try:
-            # Check if data directory exists, create if not
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            
-            # Check if the data file exists
-            if not os.path.exists(self.data_file):
-                logger.info(f"Actor database file not found. Creating default database at {self.data_file}")
-                await self._create_default_database()
-            
-            # Load the actor data
-            async with aiofiles.open(self.data_file, 'r') as f:
-                content = await f.read()
-                data = json.loads(content)
-                
-                # Validate the data structure
-                if not isinstance(data, dict):
-                    logger.error("Invalid actor database format. Expected a dictionary.")
-                    await self._create_default_database()
-                    return
-                
-                # Load actors by category
-                self.actors["hollywood"] = data.get("hollywood", [])
-                self.actors["bollywood"] = data.get("bollywood", [])
-                self.actors["apps"] = data.get("apps", [])
-                self.actors["food"] = data.get("food", [])
-                
-                logger.info(f"Loaded {len(self.actors['hollywood'])} Hollywood actors, "
-                          f"{len(self.actors['bollywood'])} Bollywood actors, "
-                          f"{len(self.actors['apps'])} Apps, and "
-                          f"{len(self.actors['food'])} Food items")
-        
-        except Exception as e:
-            logger.error(f"Error loading actor database: {e}")
-            await self._create_default_database()
-    
-    async def _create_default_database(self) -> None:
-        """Create a default actor database with some sample actors."""
-        default_data = {
-            "hollywood": [
-                "Tom Hanks", "Leonardo DiCaprio", "Brad Pitt", "Jennifer Lawrence", 
-                "Meryl Streep", "Denzel Washington", "Robert Downey Jr.", "Scarlett Johansson",
-                "Johnny Depp", "Will Smith", "Emma Stone", "Chris Hemsworth", 
-                "Ryan Reynolds", "Dwayne Johnson", "Anne Hathaway", "Chris Evans",
-                "Morgan Freeman", "Sandra Bullock", "Tom Cruise", "Julia Roberts",
-                "Samuel L. Jackson", "Angelina Jolie", "Hugh Jackman", "Jennifer Aniston",
-                "Chris Pratt", "Matt Damon", "Natalie Portman", "Benedict Cumberbatch",
-                "Keanu Reeves", "Charlize Theron"
-            ],
-            "bollywood": [
-                "Shah Rukh Khan", "Amitabh Bachchan", "Deepika Padukone", "Aamir Khan",
-                "Priyanka Chopra", "Salman Khan", "Kareena Kapoor", "Hrithik Roshan",
-                "Aishwarya Rai", "Ranbir Kapoor", "Katrina Kaif", "Akshay Kumar",
-                "Anushka Sharma", "Ranveer Singh", "Alia Bhatt", "Shahid Kapoor",
-                "Kajol", "Ajay Devgn", "Madhuri Dixit", "Varun Dhawan",
-                "Vidya Balan", "Sanjay Dutt", "Sonam Kapoor", "John Abraham",
-                "Shraddha Kapoor", "Irrfan Khan", "Kangana Ranaut", "Anil Kapoor",
-                "Tabu", "Nawazuddin Siddiqui"
-            ],
-            "apps": [
-                "Instagram", "Facebook", "WhatsApp", "TikTok", "YouTube", 
-                "Twitter", "Snapchat", "Netflix", "Spotify", "Uber",
-                "Gmail", "Google Maps", "Amazon", "Pinterest", "Zoom",
-                "Discord", "Slack", "Microsoft Teams", "Telegram", "Reddit",
-                "LinkedIn", "Twitch", "Hulu", "Disney+", "Duolingo",
-                "Candy Crush", "Minecraft", "Fortnite", "Roblox", "Among Us"
-            ],
-            "food": [
-                "Pizza", "Hamburger", "Sushi", "Chocolate", "Ice Cream",
-                "Pasta", "Taco", "Curry", "Fried Chicken", "Pancake",
-                "Donut", "French Fries", "Sandwich", "Noodles", "Steak",
-                "Salad", "Burrito", "Croissant", "Macaroni and Cheese", "Cupcake",
-                "Ramen", "Lasagna", "Cheesecake", "Waffles", "Brownies",
-                "Pho", "Popcorn", "Nachos", "Barbeque Ribs", "Butter Chicken"
-            ]
-        }
-        
-        try:
-            # Create the data directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            
-            # Write the default data to the file
-            async with aiofiles.open(self.data_file, 'w') as f:
-                await f.write(json.dumps(default_data, indent=2))
-            
-            # Load the actors into memory
-            self.actors["hollywood"] = default_data["hollywood"]
-            self.actors["bollywood"] = default_data["bollywood"]
-            self.actors["apps"] = default_data["apps"]
-            self.actors["food"] = default_data["food"]
-            
-            logger.info("Created default actor database")
-        
-        except Exception as e:
-            logger.error(f"Error creating default actor database: {e}")
+        await self.catalog.ensure_loaded()
     
     async def get_actors_by_category(self, category: str) -> List[str]:
         """
         Get the list of actors for a specific category.
         
         Args:
-            category: The category ("hollywood", "bollywood", "apps", or "food")
+            category: The category key, e.g. "hollywood" (see data/categories.json)
             
         Returns:
             A list of actor names
         """
         category = category.lower()
         
-        if category not in self.actors:
+        if not await self.catalog.has_category(category):
             logger.warning(f"Invalid category: {category}. Using Hollywood as default.")
             category = "hollywood"
         
-        return self.actors[category]
+        return await self.catalog.get_category(category)
+    
+    async def get_actors_page(self, category: str, page: int = 1, per_page: int = 50) -> List[str]:
+        """
+        Get one page of actors from a category, for listing large categories.
+        
+        Args:
+            category: The category to list
+            page: The page number, starting at 1
+            per_page: The number of actors per page
+            
+        Returns:
+            A list of actor names (empty past the last page)
+        """
+        return await self.catalog.list_items(category.lower(), (max(page, 1) - 1) * per_page, per_page)
     
     async def add_actor(self, category: str, actor_name: str) -> bool:
         """
@@ -148,21 +72,15 @@ class ActorDatabase:
         """
         category = category.lower()
         
-        if category not in self.actors:
+        if not await self.catalog.has_category(category):
             logger.warning(f"Invalid category: {category}")
             return False
         
-        # Check if actor already exists
-        if actor_name in self.actors[category]:
+        # Add the actor and save the updated database
+        if not await self.catalog.add(category, actor_name):
             logger.warning(f"Actor {actor_name} already exists in {category}")
             return False
         
-        # Add the actor
-        self.actors[category].append(actor_name)
-        
-        # Save the updated database
-        await self._save_database()
-        
         return True
     
     async def remove_actor(self, category: str, actor_name: str) -> bool:
@@ -178,37 +96,53 @@ class ActorDatabase:
         """
         category = category.lower()
         
-        if category not in self.actors:
+        if not await self.catalog.has_category(category):
             logger.warning(f"Invalid category: {category}")
             return False
         
-        # Check if actor exists
-        if actor_name not in self.actors[category]:
+        # Remove the actor and save the updated database
+        if not await self.catalog.remove(category, actor_name):
             logger.warning(f"Actor {actor_name} not found in {category}")
             return False
         
-        # Remove the actor
-        self.actors[category].remove(actor_name)
-        
-        # Save the updated database
-        await self._save_database()
-        
         return True
     
-    async def _save_database(self) -> None:
-        """Save the current actor database to the JSON file."""
-        try:
-            data = {
-                "hollywood": self.actors["hollywood"],
-                "bollywood": self.actors["bollywood"],
-                "apps": self.actors["apps"],
-                "food": self.actors["food"]
-            }
+    async def add_actors(self, category: str, actor_names: List[str]) -> int:
+        """
+        Add many actors to the database in one edit (e.g. a bulk import).
+        
+        Args:
+            category: The category to add the actors to
+            actor_names: The names of the actors to add
             
-            async with aiofiles.open(self.data_file, 'w') as f:
-                await f.write(json.dumps(data, indent=2))
+        Returns:
+            The number of actors added (existing names are skipped)
+        """
+        category = category.lower()
+        
+        if not await self.catalog.has_category(category):
+            logger.warning(f"Invalid category: {category}")
+            return 0
+        
+        added = await self.catalog.add_many(category, actor_names)
+        logger.info(f"Added {added} of {len(actor_names)} actors to {category}")
+        return added
+    
+    async def remove_actors(self, category: str, actor_names: List[str]) -> int:
+        """
+        Remove many actors from the database in one edit.
+        
+        Args:
+            category: The category to remove the actors from
+            actor_names: The names of the actors to remove
             
-            logger.info("Actor database saved")
+        Returns:
+            The number of actors removed
+        """
+        category = category.lower()
+        
+        if not await self.catalog.has_category(category):
+            logger.warning(f"Invalid category: {category}")
+            return 0
         
-        except Exception as e:
-            logger.error(f"Error saving actor database: {e}")
+        return await self.catalog.remove_many(category, actor_names)
@@ -0,0 +1,393 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.actor_catalog import DEFAULT_ACTORS, DEFAULT_DATA_FILE
+from utils.category_registry import category_registry
+from utils.name_matcher import NameIndex
+
+logger = logging.getLogger('discord_bot.actor_sqlite')
+
+# Items are numbered 0..n-1 within their category, so position lookups are one index seek
+INSERT_ITEM = (
+    "INSERT OR IGNORE INTO items (category_id, name, normalized_name, position) "
+    "SELECT ?, ?, ?, IFNULL(MAX(position), -1) + 1 FROM items WHERE category_id = ?"
+)
+
+def normalize_name(name: str) -> str:
+    """Normalise an item name for duplicate detection (case and whitespace insensitive)."""
+    return re.sub(r'\s+', ' ', name).strip().casefold()
+
+class SQLiteActorCatalog:
+    """
+    Actor catalog stored in SQLite, for categories too large to keep as JSON lists.
+    
+    Offers the same async interface as ActorCatalog. Items are unique per
+    (category, normalised name) through an index, so membership checks don't
+    scan the category. Each item also has a dense position within its
+    category (kept dense on removal by moving the last item into the gap),
+    so counting, paging and uniform random draws are index lookups instead
+    of loading the whole category. All database work runs on a single
+    background thread; every edit is committed immediately and seen by other
+    processes.
+    
+    On first use an empty database is filled from the JSON data file (or the
+    defaults if there is none). Categories from the category directory are
+    imported the first time they are used; after that the database copy is
+    the one that counts.
+    """
+    
+    def __init__(self, db_path: str = "data/actors.db", json_file: Optional[str] = DEFAULT_DATA_FILE):
+        self.db_path = db_path
+        self.json_file = json_file  # Migrated into the database when it is empty
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="actor-db")
+        self._indexes: Dict[str, Tuple[Tuple[int, int], NameIndex]] = {}  # {category: ((edits, item count) at build, index)}
+        self._edits = 0  # Bumped by every edit made through this instance
+        self._imported = set()  # File categories already checked against the database
+    
+    def _connect(self, migrate: bool = True) -> sqlite3.Connection:
+        """Open the database, create the schema and migrate the JSON data if it is empty (runs on the db thread)."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS categories ("
+                "id INTEGER PRIMARY KEY, "
+                "name TEXT NOT NULL UNIQUE)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "id INTEGER PRIMARY KEY, "
+                "category_id INTEGER NOT NULL REFERENCES categories(id), "
+                "name TEXT NOT NULL, "
+                "normalized_name TEXT NOT NULL, "
+                "position INTEGER)"
+            )
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS items_category_name "
+                "ON items (category_id, normalized_name)"
+            )
+            # Superseded by the position index below
+            conn.execute("DROP INDEX IF EXISTS items_category_id")
+            self._add_positions(conn)
+            # Serves random draws, items_at, count and paginated listing
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS items_category_position ON items (category_id, position)")
+            conn.commit()
+            self._conn = conn
+            
+            if migrate and conn.execute("SELECT 1 FROM categories LIMIT 1").fetchone() is None:
+                self._migrate(self._load_json())
+        return self._conn
+    
+    @staticmethod
+    def _add_positions(conn: sqlite3.Connection) -> None:
+        """Add and fill the position column in databases created before it existed."""
+        if any(row[1] == "position" for row in conn.execute("PRAGMA table_info(items)")):
+            return
+        logger.info("Adding item positions to the actor database")
+        conn.execute("ALTER TABLE items ADD COLUMN position INTEGER")
+        positions: Dict[int, int] = {}
+        updates = []
+        for item_id, category_id in conn.execute("SELECT id, category_id FROM items ORDER BY category_id, id").fetchall():
+            position = positions.get(category_id, 0)
+            positions[category_id] = position + 1
+            updates.append((position, item_id))
+        conn.executemany("UPDATE items SET position = ? WHERE id = ?", updates)
+    
+    def _insert_items(self, category_id: int, names: Iterable[str]) -> None:
+        """Insert items at the end of a category, skipping ones already present."""
+        self._conn.executemany(
+            INSERT_ITEM,
+            ((category_id, name, normalize_name(name), category_id) for name in names)
+        )
+    
+    def _load_json(self) -> Dict[str, List[str]]:
+        """Read the JSON data file for migration, falling back to the defaults."""
+        if self.json_file and os.path.exists(self.json_file):
+            try:
+                with open(self.json_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    logger.info(f"Migrating actor data from {self.json_file} to {self.db_path}")
+                    return {name: items for name, items in data.items() if isinstance(items, list)}
+            except Exception as e:
+                logger.error(f"Error reading {self.json_file} for migration, using defaults: {e}")
+        return DEFAULT_ACTORS
+    
+    def _migrate(self, data: Dict[str, List[str]]) -> None:
+        """Insert all categories and items in one transaction."""
+        conn = self._conn
+        with conn:
+            for category, items in data.items():
+                category_id = self._category_id(category, create=True)
+                self._insert_items(category_id, (str(item) for item in items))
+        logger.info(f"Actor database initialised with {len(data)} categories")
+    
+    def _category_id(self, category: str, create: bool = False) -> Optional[int]:
+        conn = self._conn
+        category = category.lower()
+        row = conn.execute("SELECT id FROM categories WHERE name = ?", (category,)).fetchone()
+        if row is not None:
+            return row[0]
+        if not create:
+            return None
+        return conn.execute("INSERT INTO categories (name) VALUES (?)", (category,)).lastrowid
+    
+    async def _run(self, func, *args):
+        """Run a database function on the db thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def ensure_loaded(self) -> None:
+        """Open the database (migrating the JSON data on first use)."""
+        await self._run(self._connect)
+    
+    def _import_category(self, category: str, items: List[str]) -> None:
+        self._connect()
+        if self._category_id(category) is None:
+            logger.info(f"Importing category {category} ({len(items)} items) into {self.db_path}")
+            self._migrate({category: items})
+    
+    async def _run_category(self, func, category: str, *args):
+        """Run a database function for a category, importing it from the category directory on first use."""
+        category = category.lower()
+        if category not in self._imported:
+            await category_registry.refresh()
+            if category_registry.has_file(category):
+                items = await category_registry.load_items(category)
+                await self._run(self._import_category, category, items)
+            self._imported.add(category)
+        return await self._run(func, category, *args)
+    
+    def call_category(self, func, category: str, *args):
+        """Blocking version of _run_category, for WSGI threads (never call it on the event loop)."""
+        category = category.lower()
+        if category not in self._imported:
+            category_registry.discover()
+            if category_registry.has_file(category):
+                items = category_registry.read_items(category)
+                self._executor.submit(self._import_category, category, items).result()
+            self._imported.add(category)
+        return self._executor.submit(func, category, *args).result()
+    
+    def _data_version(self) -> int:
+        # Changes when another connection (e.g. another process) commits
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+    
+    async def version(self) -> Tuple[int, int]:
+        """Return a value that changes whenever the database changes, for cache validation."""
+        return (self._edits, await self._run(self._data_version))
+    
+    def _categories(self) -> List[str]:
+        conn = self._connect()
+        return [row[0] for row in conn.execute("SELECT name FROM categories ORDER BY id")]
+    
+    async def categories(self) -> List[str]:
+        """Return the names of all categories, including those in the category directory."""
+        await category_registry.refresh()
+        names = await self._run(self._categories)
+        names.extend(info.key for info in category_registry.categories() if info.path and info.key not in names)
+        return names
+    
+    async def has_category(self, category: str) -> bool:
+        """Return True if the category exists (case-insensitive)."""
+        return category.lower() in await self.categories()
+    
+    def _count(self, category: str) -> int:
+        self._connect()
+        category_id = self._category_id(category)
+        if category_id is None:
+            return 0
+        # Positions are dense, so the highest one gives the count without a scan
+        return self._conn.execute(
+            "SELECT IFNULL(MAX(position), -1) + 1 FROM items WHERE category_id = ?", (category_id,)
+        ).fetchone()[0]
+    
+    async def count(self, category: str) -> int:
+        """Return the number of items in a category."""
+        return await self._run_category(self._count, category)
+    
+    def _list_items(self, category: str, offset: int, limit: Optional[int]) -> List[str]:
+        self._connect()
+        category_id = self._category_id(category)
+        if category_id is None:
+            return []
+        rows = self._conn.execute(
+            "SELECT name FROM items WHERE category_id = ? ORDER BY position LIMIT ? OFFSET ?",
+            (category_id, -1 if limit is None else limit, offset)
+        )
+        return [row[0] for row in rows]
+    
+    async def list_items(self, category: str, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Return a page of a category's items in position order (the order items_at uses)."""
+        return await self._run_category(self._list_items, category, offset, limit)
+    
+    async def get_category(self, category: str) -> List[str]:
+        """Return all items of a category (case-insensitive). Prefer list_items or sample for large categories."""
+        return await self.list_items(category)
+    
+    def _sample(self, category: str, k: int) -> List[str]:
+        # Positions are dense, so a uniform draw is k distinct positions and k index seeks
+        count = self._count(category)
+        return self._items_at(category, random.sample(range(count), max(0, min(k, count))))
+    
+    async def sample(self, category: str, k: int) -> List[str]:
+        """Return up to k distinct random items from a category."""
+        return await self._run_category(self._sample, category, k)
+    
+    def _items_at(self, category: str, positions: List[int]) -> List[str]:
+        self._connect()
+        category_id = self._category_id(category)
+        if category_id is None:
+            return []
+        names = []
+        for position in positions:
+            # One seek in the (category_id, position) index, however large the category
+            row = self._conn.execute(
+                "SELECT name FROM items WHERE category_id = ? AND position = ?",
+                (category_id, position)
+            ).fetchone()
+            if row is not None:
+                names.append(row[0])
+        return names
+    
+    async def items_at(self, category: str, positions: Iterable[int]) -> List[str]:
+        """Return the items at the given positions of a category (positions out of range are skipped)."""
+        return await self._run_category(self._items_at, category, list(positions))
+    
+    async def name_index(self, category: str) -> NameIndex:
+        """
+        Return the fuzzy-matching index for a category.
+        
+        Built on first use; rebuilt after edits made here, or when the item
+        count changes because another process edited the database.
+        """
+        category = category.lower()
+        version = (self._edits, await self.count(category))
+        cached = self._indexes.get(category)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        items = await self.list_items(category)
+        index = await asyncio.to_thread(NameIndex, items)
+        self._indexes[category] = (version, index)
+        return index
+    
+    def _add_many(self, category: str, names: List[str]) -> int:
+        self._connect()
+        with self._conn:
+            category_id = self._category_id(category)
+            if category_id is None:
+                return 0
+            before = self._conn.total_changes
+            self._insert_items(category_id, names)
+            return self._conn.total_changes - before
+    
+    def _remove_many(self, category: str, names: List[str]) -> int:
+        self._connect()
+        with self._conn:
+            category_id = self._category_id(category)
+            if category_id is None:
+                return 0
+            removed = 0
+            for name in names:
+                row = self._conn.execute(
+                    "SELECT id, position FROM items WHERE category_id = ? AND normalized_name = ?",
+                    (category_id, normalize_name(name))
+                ).fetchone()
+                if row is None:
+                    continue
+                item_id, position = row
+                self._conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+                # Move the last item into the gap so positions stay dense
+                self._conn.execute(
+                    "UPDATE items SET position = ? WHERE category_id = ? AND position > ? AND position = "
+                    "(SELECT MAX(position) FROM items WHERE category_id = ?)",
+                    (position, category_id, position, category_id)
+                )
+                removed += 1
+            return removed
+    
+    async def add_many(self, category: str, names: Iterable[str]) -> int:
+        """Add several items to an existing category in one transaction. Returns the number added."""
+        self._edits += 1
+        return await self._run_category(self._add_many, category, list(names))
+    
+    async def remove_many(self, category: str, names: Iterable[str]) -> int:
+        """Remove several items from a category in one transaction. Returns the number removed."""
+        self._edits += 1
+        return await self._run_category(self._remove_many, category, list(names))
+    
+    async def add(self, category: str, name: str) -> bool:
+        """Add an item to an existing category. Returns False if the category is unknown or the item exists."""
+        return await self.add_many(category, [name]) == 1
+    
+    async def remove(self, category: str, name: str) -> bool:
+        """Remove an item from a category. Returns False if the category or item doesn't exist."""
+        return await self.remove_many(category, [name]) == 1
+    
+    def flush(self) -> bool:
+        """Edits are committed as they are made; nothing to write."""
+        return False
+    
+    def _import_json(self, json_file: str) -> None:
+        self.json_file = json_file
+        self._connect(migrate=False)
+        # Items already present are skipped, so importing twice is harmless
+        self._migrate(self._load_json())
+    
+    def migrate_from_json(self, json_file: str) -> None:
+        """One-shot import of a JSON data file into this database (blocking; existing items are kept)."""
+        self._executor.submit(self._import_json, json_file).result()
+
+class SyncSQLiteCatalog:
+    """Blocking access to a SQLiteActorCatalog for WSGI code; the work runs on the catalog's db thread."""
+    
+    def __init__(self, catalog: SQLiteActorCatalog):
+        self.catalog = catalog
+    
+    def categories(self) -> List[str]:
+        category_registry.discover()
+        names = self.catalog._executor.submit(self.catalog._categories).result()
+        names.extend(info.key for info in category_registry.categories() if info.path and info.key not in names)
+        return names
+    
+    def has_category(self, category: str) -> bool:
+        return category.lower() in self.categories()
+    
+    def get_category(self, category: str) -> List[str]:
+        return self.list_items(category)
+    
+    def list_items(self, category: str, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        return self.catalog.call_category(self.catalog._list_items, category, offset, limit)
+    
+    def add(self, category: str, name: str) -> bool:
+        self.catalog._edits += 1
+        return self.catalog.call_category(self.catalog._add_many, category, [name]) == 1
+    
+    def remove(self, category: str, name: str) -> bool:
+        self.catalog._edits += 1
+        return self.catalog.call_category(self.catalog._remove_many, category, [name]) == 1
+    
+    def version(self) -> Tuple[int, int]:
+        return (self.catalog._edits, self.catalog._executor.submit(self.catalog._data_version).result())
+
+if __name__ == "__main__":
+    # python -m utils.actor_sqlite [actors.json] [actors.db]
+    logging.basicConfig(level=logging.INFO)
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_FILE
+    target = sys.argv[2] if len(sys.argv) > 2 else "data/actors.db"
+    store = SQLiteActorCatalog(target, json_file=None)
+    store.migrate_from_json(source)
+    for name in store._executor.submit(store._categories).result():
+        print(f"{name}: {store._executor.submit(store._count, name).result()} items")
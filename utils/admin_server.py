@@ -0,0 +1,186 @@
+import hmac
+import ipaddress
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import web
+
+from utils.actor_catalog import actor_catalog
+
+logger = logging.getLogger('discord_bot.admin_server')
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+class AdminServer:
+    """
+    JSON admin API served from inside the bot process, on the bot's own event loop.
+    
+    Handlers run on the same loop as discord.py, so they read guilds, games
+    and the catalog directly, with no snapshots, copies or locks. The Flask
+    dashboard keeps serving the HTML pages.
+    
+    If a token is configured, every request needs `Authorization: Bearer
+    <token>`. Without a token the server only binds to a loopback address.
+    """
+    
+    def __init__(self, bot, host: str = "127.0.0.1", port: int = 8081, token: str = "",
+                 status: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.token = token
+        self.status = status  # Builds a fresh bot status dict (see app.build_bot_status)
+        self._runner: Optional[web.AppRunner] = None
+    
+    def _create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._auth])
+        app.add_routes([
+            web.get("/status", self.get_status),
+            web.get("/metrics", self.get_metrics),
+            web.get("/guilds/{guild_id:\\d+}", self.get_guild),
+            web.get("/actors", self.list_categories),
+            web.get("/actors/{category}", self.list_actors),
+            web.post("/actors/{category}", self.add_actors),
+            web.delete("/actors/{category}/{name}", self.remove_actor),
+        ])
+        return app
+    
+    async def start(self) -> bool:
+        """Start serving. Returns False if the configuration is unsafe."""
+        if not self.token and not _is_loopback(self.host):
+            logger.error(f"Admin API not started: set ADMIN_API_TOKEN to listen on {self.host}")
+            return False
+        self._runner = web.AppRunner(self._create_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Admin API listening on http://{self.host}:{self.port}")
+        return True
+    
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    @web.middleware
+    async def _auth(self, request: web.Request, handler):
+        if self.token:
+            expected = f"Bearer {self.token}"
+            if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+                return web.json_response({"error": "unauthorized"}, status=401)
+        return await handler(request)
+    
+    async def get_status(self, request: web.Request) -> web.Response:
+        if self.status is None:
+            return web.json_response({"connected": self.bot.is_ready()})
+        return web.json_response(self.status())
+    
+    async def get_metrics(self, request: web.Request) -> web.Response:
+        from utils.dm_broadcast import dm_broadcast_stats
+        from utils.lyrics_fetcher import lyrics_metrics
+        
+        metrics = {
+            "latency_ms": round(self.bot.latency * 1000, 1) if self.bot.is_ready() else None,
+            "lyrics": lyrics_metrics(),
+            "dm_broadcast": dm_broadcast_stats(),
+            "actor_catalog": {
+                "reloads": getattr(actor_catalog, "reloads", None),
+                "writes": getattr(actor_catalog, "writes", None)
+            }
+        }
+        game_cog = self.bot.get_cog('ActorGame')
+        if game_cog is not None:
+            metrics["games"] = {
+                "active": len(game_cog.active_games),
+                "inactivity": game_cog.inactivity.stats()
+            }
+        return web.json_response(metrics)
+    
+    async def get_guild(self, request: web.Request) -> web.Response:
+        guild = self.bot.get_guild(int(request.match_info["guild_id"]))
+        if guild is None:
+            return web.json_response({"error": "guild not found"}, status=404)
+        
+        games = []
+        game_cog = self.bot.get_cog('ActorGame')
+        if game_cog is not None:
+            for session in game_cog.games_in_guild(guild.id):
+                # Leave out the assigned items; they are the answers
+                games.append({
+                    "channel_id": session.channel_id,
+                    "category": session.category,
+                    "host_id": session.host_id,
+                    "players": len(session.players),
+                    "in_progress": session.is_in_progress,
+                    "remaining_players": session.remaining_players,
+                    "last_activity": session.last_activity
+                })
+        
+        music_cog = self.bot.get_cog('MusicPlayer')
+        queue = music_cog.music_queues.get(guild.id) if music_cog is not None else None
+        
+        return web.json_response({
+            "id": guild.id,
+            "name": guild.name,
+            "member_count": guild.member_count,
+            "icon_url": str(guild.icon.url) if guild.icon else None,
+            "games": games,
+            "music_queue_length": len(queue) if queue is not None else 0
+        })
+    
+    async def list_categories(self, request: web.Request) -> web.Response:
+        categories = {}
+        for category in await actor_catalog.categories():
+            categories[category] = await actor_catalog.count(category)
+        return web.json_response({"categories": categories})
+    
+    async def list_actors(self, request: web.Request) -> web.Response:
+        category = request.match_info["category"]
+        if not await actor_catalog.has_category(category):
+            return web.json_response({"error": "category not found"}, status=404)
+        try:
+            offset = max(int(request.query.get("offset", 0)), 0)
+            limit = min(max(int(request.query.get("limit", 100)), 1), 1000)
+        except ValueError:
+            return web.json_response({"error": "offset and limit must be integers"}, status=400)
+        
+        return web.json_response({
+            "category": category.lower(),
+            "total": await actor_catalog.count(category),
+            "offset": offset,
+            "items": await actor_catalog.list_items(category, offset, limit)
+        })
+    
+    async def add_actors(self, request: web.Request) -> web.Response:
+        category = request.match_info["category"]
+        if not await actor_catalog.has_category(category):
+            return web.json_response({"error": "category not found"}, status=404)
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            return web.json_response({"error": "expected a JSON object"}, status=400)
+        
+        names = body.get("names") or ([body["name"]] if body.get("name") else [])
+        if isinstance(names, list):
+            names = [str(name).strip() for name in names if str(name).strip()]
+        if not names or not isinstance(names, list):
+            return web.json_response({"error": "give a \"name\" or a list of \"names\""}, status=400)
+        
+        added = await actor_catalog.add_many(category, names)
+        logger.info(f"Admin API added {added} items to {category}")
+        return web.json_response({"added": added}, status=201 if added else 200)
+    
+    async def remove_actor(self, request: web.Request) -> web.Response:
+        category = request.match_info["category"]
+        name = request.match_info["name"]
+        if not await actor_catalog.remove(category, name):
+            return web.json_response({"error": "item not found"}, status=404)
+        logger.info(f"Admin API removed {name} from {category}")
+        return web.json_response({"removed": name})
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger('discord_bot.category_registry')
+
+DEFAULT_MANIFEST = "data/categories.json"
+DEFAULT_CATEGORY_DIR = "data/categories"
+
+SEPARATORS = re.compile(r'[\s_-]+')
+
+def lookup_key(name: str) -> str:
+    """Key used to resolve what a user typed ("Video-Games", "video games" -> "video games")."""
+    return SEPARATORS.sub(" ", name.lower()).strip()
+
+class CategoryInfo:
+    """Metadata of one category."""
+    
+    __slots__ = ("key", "name", "noun", "plural", "aliases", "path")
+    
+    def __init__(self, key: str, name: Optional[str] = None, noun: str = "item",
+                 plural: Optional[str] = None, aliases: Tuple[str, ...] = (), path: Optional[str] = None):
+        self.key = key  # Lowercase key used by the catalog
+        self.name = name or key.replace("_", " ").title()  # Display name
+        self.noun = noun  # What one item is called ("actor", "app", "food item")
+        self.plural = plural or f"{noun}s"
+        self.aliases = aliases
+        self.path = path  # Item list file in the category directory, if the category has one
+
+class CategoryRegistry:
+    """
+    Categories and their metadata, discovered from the data directory.
+    
+    Metadata (display name, item noun, aliases) comes from the manifest,
+    data/categories.json. Extra categories are JSON lists of items in
+    data/categories/<key>.json; listing the directory only reads file names,
+    and a category's items are read the first time it is played (and again
+    only if its file changes). Categories without a manifest entry get a
+    display name from their key and "item" as their noun.
+    
+    Names and aliases resolve through one precomputed lowercase map. Lookups
+    only read the cached table; it is rebuilt when the manifest's or the
+    directory's modification time changes. Async code calls refresh(), which
+    costs two stat() calls and rebuilds in a thread; WSGI threads call
+    discover().
+    """
+    
+    def __init__(self, manifest: str = DEFAULT_MANIFEST, directory: str = DEFAULT_CATEGORY_DIR):
+        self.manifest = manifest
+        self.directory = directory
+        # (categories by key, lowercase name, key or alias -> key), swapped in as one
+        self._table: Tuple[Dict[str, CategoryInfo], Dict[str, str]] = ({}, {})
+        self._signature: Optional[Tuple[Optional[int], Optional[int]]] = None
+        self._items: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}  # {key: ((mtime_ns, size), items)}
+    
+    @staticmethod
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _current_signature(self) -> Tuple[Optional[int], Optional[int]]:
+        return (self._mtime(self.manifest), self._mtime(self.directory))
+    
+    async def refresh(self) -> None:
+        """Rebuild the category table in a thread if the manifest or the category directory changed."""
+        if self._current_signature() != self._signature:
+            await asyncio.to_thread(self.discover)
+    
+    def discover(self) -> None:
+        """(Re)build the category table if the manifest or the category directory changed (blocking)."""
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        
+        metadata = {}
+        if signature[0] is not None:
+            try:
+                with open(self.manifest, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading category manifest {self.manifest}: {e}")
+        
+        files = {}
+        if signature[1] is not None:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        files[entry.name[:-5].lower()] = entry.path
+        
+        categories = {}
+        for key in list(metadata) + [key for key in files if key not in metadata]:
+            meta = metadata.get(key, {})
+            key = key.lower()
+            categories[key] = CategoryInfo(
+                key,
+                name=meta.get("name"),
+                noun=meta.get("noun", "item"),
+                plural=meta.get("plural"),
+                aliases=tuple(meta.get("aliases", ())),
+                path=files.get(key)
+            )
+        
+        lookup = {}
+        for info in categories.values():
+            for name in (info.key, info.name) + info.aliases:
+                lookup.setdefault(lookup_key(name), info.key)
+        
+        self._table = (categories, lookup)
+        self._signature = signature
+        logger.info(f"Discovered {len(categories)} categories ({len(files)} category files)")
+    
+    def _categories(self) -> Dict[str, CategoryInfo]:
+        if self._signature is None:
+            # Not discovered yet (normally done by refresh() when the game cog loads)
+            self.discover()
+        return self._table[0]
+    
+    def categories(self) -> List[CategoryInfo]:
+        """Return all known categories, manifest order first."""
+        return list(self._categories().values())
+    
+    def resolve(self, name: str) -> Optional[CategoryInfo]:
+        """Return the category a name, key or alias refers to (case and separator insensitive)."""
+        categories = self._categories()
+        key = self._table[1].get(lookup_key(name))
+        return None if key is None else categories.get(key)
+    
+    def get(self, key: str) -> CategoryInfo:
+        """Return a category's metadata, or defaults for a category only known to the catalog."""
+        info = self._categories().get(key.lower())
+        return info if info is not None else CategoryInfo(key.lower())
+    
+    def has_file(self, key: str) -> bool:
+        """Return True if the category has an item file in the category directory."""
+        info = self._categories().get(key.lower())
+        return info is not None and info.path is not None
+    
+    def _cached_items(self, info: CategoryInfo) -> Tuple[Optional[Tuple[int, int]], Optional[List[str]]]:
+        """Return the file's (mtime_ns, size) signature and the cached items if they still match it."""
+        try:
+            st = os.stat(info.path)
+        except OSError:
+            return None, None
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._items.get(info.key)
+        return signature, (cached[1] if cached is not None and cached[0] == signature else None)
+    
+    async def load_items(self, key: str) -> List[str]:
+        """Return the items of a file category, reading the file (in a thread) on first use or after it changed."""
+        await self.refresh()
+        info = self.get(key)
+        if info.path is None:
+            return []
+        items = self._cached_items(info)[1]
+        if items is not None:
+            return items
+        return await asyncio.to_thread(self.read_items, key)
+    
+    def read_items(self, key: str) -> List[str]:
+        """Blocking version of load_items, for WSGI threads."""
+        self.discover()
+        info = self.get(key)
+        if info.path is None:
+            return []
+        signature, items = self._cached_items(info)
+        if items is not None:
+            return items
+        if signature is None:
+            return []
+        
+        cached = self._items.get(info.key)
+        try:
+            with open(info.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, list):
+                raise ValueError("expected a list of items")
+        except Exception as e:
+            logger.error(f"Error loading category file {info.path}: {e}")
+            return cached[1] if cached is not None else []
+        
+        items = [str(item) for item in data]
+        self._items[info.key] = (signature, items)
+        logger.info(f"Loaded category {info.key}: {len(items)} items")
+        return items
+
+# Global registry shared by the game cog and the actor catalog
+category_registry = CategoryRegistry()
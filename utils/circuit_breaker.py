@@ -0,0 +1,104 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('discord_bot.circuit_breaker')
+
+class CircuitBreaker:
+    """
+    Circuit breaker for an unreliable external service.
+    
+    After `failure_threshold` consecutive failures the breaker opens and requests
+    fail fast. Once `recovery_timeout` seconds have passed it goes half-open and
+    lets a limited number of probe requests through: a successful probe closes
+    the breaker again, a failed one re-opens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self._last_probe_at = 0.0
+        
+        # Counters for metrics
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the recovery timeout has passed."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit breaker '{self.name}' half-open, probing service")
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """Return True if a request may be attempted now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            # Allow fresh probes if earlier ones never reported back
+            if time.monotonic() - self._last_probe_at >= self.recovery_timeout:
+                self._half_open_calls = 0
+            if self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                self._last_probe_at = time.monotonic()
+                return True
+        self.rejected += 1
+        return False
+    
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self.total_successes += 1
+        self.consecutive_failures = 0
+        if self._state != self.CLOSED:
+            logger.info(f"Circuit breaker '{self.name}' closed")
+        self._state = self.CLOSED
+        self._opened_at = None
+    
+    def record_failure(self) -> None:
+        """Record a failed call (error, timeout or bad status)."""
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+    
+    def _open(self) -> None:
+        if self._state != self.OPEN:
+            self.times_opened += 1
+            logger.warning(f"Circuit breaker '{self.name}' opened after {self.consecutive_failures} consecutive failures")
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+    
+    def retry_after(self) -> float:
+        """Seconds until the breaker will allow a probe (0 if requests are allowed)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return breaker state and counters for metrics."""
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "total_successes": self.total_successes,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "retry_after": round(self.retry_after(), 1)
+        }
@@ -0,0 +1,154 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger('discord_bot.deadline_scheduler')
+
+# Called with the key when its deadline passes. Return a later deadline to
+# re-arm the key (e.g. because there was activity since it was scheduled),
+# or None once it has been handled.
+ExpireCallback = Callable[[Hashable], Awaitable[Optional[float]]]
+
+class DeadlineScheduler:
+    """
+    Runs a callback when a key's deadline passes, using a heap of deadlines.
+    
+    A single sleeper task waits until the earliest deadline instead of
+    polling everything on an interval. Deadlines are wall-clock timestamps
+    (time.time()), so they can be derived from stored activity times.
+    
+    Invalidation is lazy: moving a key's deadline later only updates a dict,
+    and the stale heap entry is re-pushed with the current deadline when it
+    reaches the top. The heap therefore holds at most one live entry per key
+    plus entries for keys whose deadline moved earlier.
+    """
+    
+    def __init__(self, name: str, on_expire: ExpireCallback):
+        self.name = name
+        self.on_expire = on_expire
+        self._heap: List[Tuple[float, int, Hashable]] = []  # (deadline, sequence, key)
+        self._deadlines: Dict[Hashable, float] = {}  # Current deadline of each scheduled key
+        self._queued: Dict[Hashable, float] = {}  # Earliest deadline each key has in the heap
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._callbacks: Set[asyncio.Task] = set()
+        
+        # Counters for metrics
+        self.expired = 0
+        self.rearmed = 0
+    
+    def __len__(self) -> int:
+        return len(self._deadlines)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+    
+    def deadline(self, key: Hashable) -> Optional[float]:
+        """Return the key's current deadline, or None if it isn't scheduled."""
+        return self._deadlines.get(key)
+    
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """Set (or move) the deadline for a key."""
+        self._ensure_running()
+        self._deadlines[key] = deadline
+        
+        queued = self._queued.get(key)
+        if queued is not None and queued <= deadline:
+            # The existing heap entry fires first and will be re-armed then
+            return
+        
+        self._queued[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._sequence), key))
+        if self._heap[0][2] == key:
+            # New earliest deadline; wake the sleeper so it can sleep less
+            self._wake()
+    
+    def schedule_in(self, key: Hashable, delay: float) -> None:
+        """Set the deadline for a key to `delay` seconds from now."""
+        self.schedule(key, time.time() + delay)
+    
+    def cancel(self, key: Hashable) -> None:
+        """Forget a key; its heap entry is discarded when it reaches the top."""
+        self._deadlines.pop(key, None)
+    
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # No loop yet; started by the first schedule() inside one
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+    
+    def stop(self) -> None:
+        """Stop the sleeper task (scheduled deadlines are kept)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._callbacks):
+            task.cancel()
+    
+    async def _run(self) -> None:
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            deadline, _, key = self._heap[0]
+            delay = deadline - time.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(self._heap)
+            if self._queued.get(key) == deadline:
+                del self._queued[key]
+            
+            current = self._deadlines.get(key)
+            if current is None:
+                continue  # Cancelled
+            if current > deadline:
+                # Deadline moved later since this entry was pushed
+                if key not in self._queued:
+                    self._queued[key] = current
+                    heapq.heappush(self._heap, (current, next(self._sequence), key))
+                continue
+            
+            del self._deadlines[key]
+            self.expired += 1
+            # Run callbacks as tasks so a slow one doesn't delay other expiries
+            task = asyncio.create_task(self._expire(key))
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+    
+    async def _expire(self, key: Hashable) -> None:
+        try:
+            next_deadline = await self.on_expire(key)
+        except Exception as e:
+            logger.error(f"Error in {self.name} expiry callback for {key}: {e}")
+            return
+        if next_deadline is not None and key not in self._deadlines:
+            self.rearmed += 1
+            self.schedule(key, next_deadline)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return scheduler counters for metrics."""
+        return {
+            "scheduled": len(self._deadlines),
+            "heap_size": len(self._heap),
+            "expired": self.expired,
+            "rearmed": self.rearmed
+        }
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Dict, Iterable, List, Tuple
+
+import discord
+
+logger = logging.getLogger('discord_bot.dm_broadcast')
+
+# Sends in flight at once across the whole bot. Every DM channel has its own
+# message bucket, but opening a DM channel goes through one shared route.
+MAX_CONCURRENT_DMS = 5
+
+# (send slots, DM-open lock) per event loop. asyncio primitives bind to the
+# first loop that waits on them, and main.py starts a new loop on every
+# reconnect, so they can't be module-level singletons.
+_loop_primitives: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[asyncio.Semaphore, asyncio.Lock]]" = weakref.WeakKeyDictionary()
+
+# Counters for metrics
+_stats = {
+    "broadcasts": 0,
+    "messages": 0,
+    "forbidden": 0,
+    "failed": 0,
+    "last_ms": 0.0,
+    "max_ms": 0.0,
+    "total_ms": 0.0
+}
+
+def _primitives() -> Tuple[asyncio.Semaphore, asyncio.Lock]:
+    """Return the send semaphore and DM-open lock for the running event loop."""
+    loop = asyncio.get_running_loop()
+    primitives = _loop_primitives.get(loop)
+    if primitives is None:
+        primitives = _loop_primitives[loop] = (asyncio.Semaphore(MAX_CONCURRENT_DMS), asyncio.Lock())
+    return primitives
+
+class BroadcastResult:
+    """Outcome of a DM broadcast."""
+    
+    def __init__(self):
+        self.sent: List[discord.abc.User] = []
+        self.forbidden: List[discord.abc.User] = []  # Users who don't accept DMs from the bot
+        self.failed: List[discord.abc.User] = []  # Other errors (after discord.py's own retries)
+        self.elapsed = 0.0  # Seconds for the whole fan-out
+    
+    @property
+    def undelivered(self) -> List[discord.abc.User]:
+        return self.forbidden + self.failed
+    
+    def failure_summary(self) -> str:
+        """One channel message listing everyone who didn't get their DM, or "" if all were delivered."""
+        if not self.undelivered:
+            return ""
+        mentions = ", ".join(user.mention for user in self.undelivered)
+        return f"⚠️ Couldn't send a DM to {mentions}. Please enable DMs from server members."
+
+async def _send_one(user: discord.abc.User, kwargs: Dict[str, Any], result: BroadcastResult) -> None:
+    send_slots, open_dm_lock = _primitives()
+    async with send_slots:
+        try:
+            if getattr(user, "dm_channel", None) is None:
+                # Open DM channels one at a time; they all share one rate-limit bucket
+                async with open_dm_lock:
+                    if user.dm_channel is None:
+                        await user.create_dm()
+            await user.send(**kwargs)
+            result.sent.append(user)
+        except discord.Forbidden:
+            result.forbidden.append(user)
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to send DM to {user.id}: {e}")
+            result.failed.append(user)
+
+async def broadcast_dms(messages: Iterable[Tuple[discord.abc.User, Dict[str, Any]]]) -> BroadcastResult:
+    """
+    Send DMs to several users concurrently.
+    
+    Args:
+        messages: (user, send kwargs) pairs, e.g. (member, {"embed": embed})
+    
+    Returns:
+        A BroadcastResult with who was reached; failures don't raise
+    """
+    result = BroadcastResult()
+    start = time.perf_counter()
+    
+    await asyncio.gather(*(_send_one(user, kwargs, result) for user, kwargs in messages))
+    
+    result.elapsed = time.perf_counter() - start
+    elapsed_ms = result.elapsed * 1000
+    _stats["broadcasts"] += 1
+    _stats["messages"] += len(result.sent) + len(result.undelivered)
+    _stats["forbidden"] += len(result.forbidden)
+    _stats["failed"] += len(result.failed)
+    _stats["last_ms"] = round(elapsed_ms, 1)
+    _stats["max_ms"] = round(max(_stats["max_ms"], elapsed_ms), 1)
+    _stats["total_ms"] += elapsed_ms
+    logger.debug(f"DM broadcast to {len(result.sent) + len(result.undelivered)} users took {elapsed_ms:.0f} ms")
+    
+    return result
+
+def dm_broadcast_stats() -> Dict[str, Any]:
+    """Return DM fan-out counters and latency for metrics."""
+    stats = dict(_stats)
+    stats["avg_ms"] = round(stats.pop("total_ms") / stats["broadcasts"], 1) if stats["broadcasts"] else 0.0
+    return stats
@@ -1,9 +1,11 @@
 import time
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
 class Player:
     """Class representing a player in the 'Guess It' game."""
     
+    __slots__ = ("id", "name", "actor", "has_guessed_correctly", "guess_count")
+    
     def __init__(self, id: int, name: str):
         self.id = id  # Discord user ID
         self.name = name  # Discord display name
@@ -17,31 +19,34 @@ class Player:
 class GameSession:
     """Class representing a game session for the 'Guess It' game."""
     
-    def __init__(self, host_id: int, channel_id: int, category: str):
+    __slots__ = ("host_id", "channel_id", "guild_id", "category", "players", "is_in_progress", "last_activity",
+                 "correct_guesses")
+    
+    def __init__(self, host_id: int, channel_id: int, category: str, guild_id: Optional[int] = None):
         self.host_id = host_id  # ID of the user who started the game
         self.channel_id = channel_id  # ID of the channel where the game is played
+        self.guild_id = guild_id  # ID of the server the channel belongs to
         self.category = category  # Actor category (e.g., "Hollywood", "Bollywood")
-        self.players: List[Player] = []  # List of players in the game
+        self.players: Dict[int, Player] = {}  # {user_id: Player}, in join order
         self.is_in_progress = False  # Whether actors have been assigned
         self.last_activity = time.time()  # Time of last activity in the game
+        self.correct_guesses = 0  # Number of players who have guessed correctly
     
     def add_player(self, player: Player) -> None:
         """Add a player to the game."""
-        self.players.append(player)
+        self.players[player.id] = player
         self.last_activity = time.time()
     
     def get_player(self, player_id: int) -> Optional[Player]:
         """Get a player by their Discord ID."""
-        for player in self.players:
-            if player.id == player_id:
-                return player
-        return None
+        return self.players.get(player_id)
     
     def remove_player(self, player_id: int) -> bool:
         """Remove a player from the game."""
-        player = self.get_player(player_id)
+        player = self.players.pop(player_id, None)
         if player:
-            self.players.remove(player)
+            if player.has_guessed_correctly:
+                self.correct_guesses -= 1
             self.last_activity = time.time()
             return True
         return False
@@ -51,15 +56,56 @@ class GameSession:
         if len(actors) < len(self.players):
             raise ValueError("Not enough actors for all players")
         
-        for i, player in enumerate(self.players):
-            player.actor = actors[i]
+        for player, actor in zip(self.players.values(), actors):
+            player.actor = actor
         
         self.is_in_progress = True
         self.last_activity = time.time()
     
+    def record_correct_guess(self, player: Player) -> None:
+        """Mark a player as having guessed their actor correctly."""
+        if not player.has_guessed_correctly:
+            player.has_guessed_correctly = True
+            self.correct_guesses += 1
+    
+    @property
+    def remaining_players(self) -> int:
+        """Number of players who still need to guess their actor."""
+        return len(self.players) - self.correct_guesses
+    
     def all_guessed_correctly(self) -> bool:
         """Check if all players have guessed their actors correctly."""
-        return all(player.has_guessed_correctly for player in self.players)
+        return self.correct_guesses == len(self.players)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise the session for the session journal."""
+        return {
+            "host": self.host_id,
+            "channel": self.channel_id,
+            "guild": self.guild_id,
+            "category": self.category,
+            "in_progress": self.is_in_progress,
+            "last_activity": self.last_activity,
+            "players": [
+                [p.id, p.name, p.actor, p.has_guessed_correctly, p.guess_count]
+                for p in self.players.values()
+            ]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameSession":
+        """Rebuild a session saved with to_dict()."""
+        session = cls(data["host"], data["channel"], data["category"], guild_id=data.get("guild"))
+        for player_id, name, actor, correct, guess_count in data["players"]:
+            player = Player(player_id, name)
+            player.actor = actor
+            player.guess_count = guess_count
+            session.players[player_id] = player
+            if correct:
+                session.record_correct_guess(player)
+        session.is_in_progress = data["in_progress"]
+        session.last_activity = data["last_activity"]
+        return session
     
     def __str__(self):
         return f"GameSession(host={self.host_id}, players={len(self.players)}, in_progress={self.is_in_progress})"
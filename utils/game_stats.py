@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from utils.game_manager import GameSession, Player
+
+logger = logging.getLogger('discord_bot.game_stats')
+
+DEFAULT_DB_PATH = "data/game_stats.db"
+
+SCHEMA = (
+    # Append-only history; aggregates below are derived from it
+    "CREATE TABLE IF NOT EXISTS events ("
+    "id INTEGER PRIMARY KEY, "
+    "ts REAL NOT NULL, "
+    "kind TEXT NOT NULL, "  # "guess" or "game_end"
+    "guild_id INTEGER, "
+    "channel_id INTEGER, "
+    "user_id INTEGER, "
+    "category TEXT, "
+    "item TEXT, "
+    "correct INTEGER, "
+    "guesses INTEGER, "
+    "detail TEXT)",
+    "CREATE TABLE IF NOT EXISTS user_stats ("
+    "guild_id INTEGER NOT NULL, "
+    "user_id INTEGER NOT NULL, "
+    "name TEXT NOT NULL, "
+    "games INTEGER NOT NULL DEFAULT 0, "
+    "wins INTEGER NOT NULL DEFAULT 0, "
+    "win_guesses INTEGER NOT NULL DEFAULT 0, "  # Guesses used in won rounds, for the average
+    "guesses INTEGER NOT NULL DEFAULT 0, "
+    "streak INTEGER NOT NULL DEFAULT 0, "
+    "best_streak INTEGER NOT NULL DEFAULT 0, "
+    "PRIMARY KEY (guild_id, user_id))",
+    # Serves the leaderboard: top wins within a guild straight off the index
+    "CREATE INDEX IF NOT EXISTS user_stats_wins ON user_stats (guild_id, wins DESC)",
+    "CREATE TABLE IF NOT EXISTS guild_stats ("
+    "guild_id INTEGER PRIMARY KEY, "
+    "games INTEGER NOT NULL DEFAULT 0, "
+    "rounds INTEGER NOT NULL DEFAULT 0, "
+    "wins INTEGER NOT NULL DEFAULT 0, "
+    "win_guesses INTEGER NOT NULL DEFAULT 0)",
+    "CREATE TABLE IF NOT EXISTS item_stats ("
+    "category TEXT NOT NULL, "
+    "item TEXT NOT NULL, "
+    "rounds INTEGER NOT NULL DEFAULT 0, "
+    "solved INTEGER NOT NULL DEFAULT 0, "
+    "win_guesses INTEGER NOT NULL DEFAULT 0, "
+    "PRIMARY KEY (category, item))",
+)
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+def _player_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "user_id": row["user_id"],
+        "name": row["name"],
+        "games": row["games"],
+        "wins": row["wins"],
+        "avg_guesses": round(row["win_guesses"] / row["wins"], 2) if row["wins"] else None,
+        "streak": row["streak"],
+        "best_streak": row["best_streak"]
+    }
+
+def _item_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "category": row["category"],
+        "item": row["item"],
+        "rounds": row["rounds"],
+        "solved": row["solved"],
+        "solve_rate": round(row["solved"] / row["rounds"], 3) if row["rounds"] else None,
+        "avg_guesses": round(row["win_guesses"] / row["solved"], 2) if row["solved"] else None
+    }
+
+def leaderboard(conn: sqlite3.Connection, guild_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+    """Top players of a guild by wins, fewest average guesses first on ties."""
+    rows = conn.execute(
+        "SELECT * FROM user_stats WHERE guild_id = ? AND wins > 0 "
+        "ORDER BY wins DESC, CAST(win_guesses AS REAL) / wins LIMIT ?",
+        (guild_id, limit)
+    )
+    return [_player_row(row) for row in rows]
+
+def player_stats(conn: sqlite3.Connection, guild_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+    """One player's aggregates in a guild, with their leaderboard rank."""
+    row = conn.execute(
+        "SELECT * FROM user_stats WHERE guild_id = ? AND user_id = ?", (guild_id, user_id)
+    ).fetchone()
+    if row is None:
+        return None
+    stats = _player_row(row)
+    stats["rank"] = conn.execute(
+        "SELECT COUNT(*) + 1 FROM user_stats WHERE guild_id = ? AND wins > ?", (guild_id, row["wins"])
+    ).fetchone()[0] if row["wins"] else None
+    return stats
+
+def hardest_items(conn: sqlite3.Connection, limit: int = 10, min_rounds: int = 3) -> List[Dict[str, Any]]:
+    """Items with the lowest solve rate (then most guesses per solve), among items dealt at least min_rounds times."""
+    rows = conn.execute(
+        "SELECT * FROM item_stats WHERE rounds >= ? "
+        "ORDER BY CAST(solved AS REAL) / rounds, "
+        "CASE WHEN solved > 0 THEN CAST(win_guesses AS REAL) / solved ELSE 0 END DESC LIMIT ?",
+        (min_rounds, limit)
+    )
+    return [_item_row(row) for row in rows]
+
+def guild_summary(conn: sqlite3.Connection, guild_id: int) -> Dict[str, Any]:
+    """Totals for one guild."""
+    row = conn.execute("SELECT * FROM guild_stats WHERE guild_id = ?", (guild_id,)).fetchone()
+    if row is None:
+        return {"guild_id": guild_id, "games": 0, "rounds": 0, "wins": 0, "avg_guesses": None}
+    return {
+        "guild_id": guild_id,
+        "games": row["games"],
+        "rounds": row["rounds"],
+        "wins": row["wins"],
+        "avg_guesses": round(row["win_guesses"] / row["wins"], 2) if row["wins"] else None
+    }
+
+def read_stats(db_path: str = DEFAULT_DB_PATH, guild_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Read precomputed stats for the dashboard (blocking; safe from another process).
+    
+    With a guild_id, returns that guild's totals and leaderboard; always
+    includes the hardest items overall.
+    """
+    if not os.path.exists(db_path):
+        return {"guild": None, "leaderboard": [], "hardest_items": []}
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        return {
+            "guild": guild_summary(conn, guild_id) if guild_id is not None else None,
+            "leaderboard": leaderboard(conn, guild_id) if guild_id is not None else [],
+            "hardest_items": hardest_items(conn)
+        }
+    finally:
+        conn.close()
+
+class GameStats:
+    """
+    Game statistics, kept as an append-only event table plus aggregates.
+    
+    Each event is written in one transaction together with the aggregate
+    rows it changes (per user, per guild and per item), so the leaderboard
+    and player stats are single indexed reads and never scan the history.
+    All database work runs on one background thread; recording is
+    fire-and-forget so game commands never wait on the disk.
+    """
+    
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="game-stats")
+    
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _connect(self.db_path)
+        return self._conn
+    
+    def _submit(self, func, *args) -> Future:
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._log_failure)
+        return future
+    
+    @staticmethod
+    def _log_failure(future: Future) -> None:
+        if future.exception() is not None:
+            logger.error(f"Error recording game stats: {future.exception()}")
+    
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def record_guess(self, session: GameSession, player: Player, correct: bool) -> None:
+        """Record a counted guess; a correct one updates wins, streaks and item difficulty."""
+        self._submit(self._record_guess, session.guild_id, session.channel_id, session.category.lower(),
+                     player.id, player.name, player.actor, correct, player.guess_count, time.time())
+    
+    def _record_guess(self, guild_id, channel_id, category, user_id, name, item, correct, guesses, ts) -> None:
+        conn = self._db()
+        with conn:
+            conn.execute(
+                "INSERT INTO events (ts, kind, guild_id, channel_id, user_id, category, item, correct, guesses) "
+                "VALUES (?, 'guess', ?, ?, ?, ?, ?, ?, ?)",
+                (ts, guild_id, channel_id, user_id, category, item, int(correct), guesses)
+            )
+            conn.execute(
+                "INSERT INTO user_stats (guild_id, user_id, name) VALUES (?, ?, ?) "
+                "ON CONFLICT (guild_id, user_id) DO UPDATE SET name = excluded.name",
+                (guild_id, user_id, name)
+            )
+            conn.execute(
+                "UPDATE user_stats SET guesses = guesses + 1 WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id)
+            )
+            if correct:
+                conn.execute(
+                    "UPDATE user_stats SET wins = wins + 1, win_guesses = win_guesses + ?, "
+                    "streak = streak + 1, best_streak = MAX(best_streak, streak + 1) "
+                    "WHERE guild_id = ? AND user_id = ?",
+                    (guesses, guild_id, user_id)
+                )
+                conn.execute(
+                    "INSERT INTO item_stats (category, item, solved, win_guesses) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (category, item) DO UPDATE SET "
+                    "solved = solved + 1, win_guesses = win_guesses + excluded.win_guesses",
+                    (category, item, guesses)
+                )
+                conn.execute(
+                    "INSERT INTO guild_stats (guild_id, wins, win_guesses) VALUES (?, 1, ?) "
+                    "ON CONFLICT (guild_id) DO UPDATE SET "
+                    "wins = wins + 1, win_guesses = win_guesses + excluded.win_guesses",
+                    (guild_id, guesses)
+                )
+    
+    def record_game_end(self, session: GameSession, reason: str) -> None:
+        """Record the end of a game that had items assigned; players who didn't guess lose their streak."""
+        if not session.is_in_progress:
+            return
+        rounds = [(player.id, player.name, player.actor, player.has_guessed_correctly)
+                  for player in session.players.values() if player.actor]
+        self._submit(self._record_game_end, session.guild_id, session.channel_id,
+                     session.category.lower(), rounds, reason, time.time())
+    
+    def _record_game_end(self, guild_id, channel_id, category, rounds, reason, ts) -> None:
+        conn = self._db()
+        with conn:
+            conn.execute(
+                "INSERT INTO events (ts, kind, guild_id, channel_id, category, detail) "
+                "VALUES (?, 'game_end', ?, ?, ?, ?)",
+                (ts, guild_id, channel_id, category, reason)
+            )
+            for user_id, name, item, guessed in rounds:
+                conn.execute(
+                    "INSERT INTO user_stats (guild_id, user_id, name, games) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT (guild_id, user_id) DO UPDATE SET name = excluded.name, games = games + 1"
+                    + ("" if guessed else ", streak = 0"),
+                    (guild_id, user_id, name)
+                )
+                conn.execute(
+                    "INSERT INTO item_stats (category, item, rounds) VALUES (?, ?, 1) "
+                    "ON CONFLICT (category, item) DO UPDATE SET rounds = rounds + 1",
+                    (category, item)
+                )
+            conn.execute(
+                "INSERT INTO guild_stats (guild_id, games, rounds) VALUES (?, 1, ?) "
+                "ON CONFLICT (guild_id) DO UPDATE SET games = games + 1, rounds = rounds + excluded.rounds",
+                (guild_id, len(rounds))
+            )
+    
+    async def leaderboard(self, guild_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Top players of a guild."""
+        return await self._run(lambda: leaderboard(self._db(), guild_id, limit))
+    
+    async def player_stats(self, guild_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        """One player's stats in a guild, or None if they haven't played."""
+        return await self._run(lambda: player_stats(self._db(), guild_id, user_id))
+    
+    def close(self) -> None:
+        """Finish pending writes and close the database (blocking)."""
+        self._executor.submit(self._close).result()
+    
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
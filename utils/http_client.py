@@ -0,0 +1,65 @@
+import aiohttp
+import logging
+from typing import Optional
+
+logger = logging.getLogger('discord_bot.http_client')
+
+class HTTPClient:
+    """
+    Bot-lifetime HTTP client shared by all outbound requests (Genius, REST integrations, ...).
+    
+    A single aiohttp session keeps connections alive between requests, so repeated
+    calls to the same host skip the DNS lookup and the TCP/TLS handshake.
+    """
+    
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 30, total_timeout: float = 10, connect_timeout: float = 5):
+        self.limit = limit  # Max open connections overall
+        self.limit_per_host = limit_per_host  # Max open connections to a single host
+        self.dns_cache_ttl = dns_cache_ttl  # Seconds to cache DNS lookups
+        self.keepalive_timeout = keepalive_timeout  # Seconds to keep idle connections open
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a pooled session bound to the running event loop."""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers={"User-Agent": "Harmonia Discord Bot"}
+        )
+    
+    async def start(self) -> None:
+        """Open the shared session (called from the bot's setup_hook)."""
+        if self._session is not None and not self._session.closed:
+            return
+        self._session = self._create_session()
+        logger.info("Shared HTTP session started")
+    
+    async def close(self) -> None:
+        """Close the shared session and its connection pool (called on shutdown)."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("Shared HTTP session closed")
+        self._session = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session, creating it lazily if the bot hasn't started it.
+        
+        Must be called from inside a running event loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+# Initialize global HTTP client
+http_client = HTTPClient()
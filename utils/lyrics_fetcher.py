@@ -1,70 +1,261 @@
 import aiohttp
+import codecs
 import logging
 import re
-import html
 import asyncio
+from collections import OrderedDict
 from typing import Dict, Optional, Any, List, Tuple
 import json
 import time
+import weakref
+
+from utils.circuit_breaker import CircuitBreaker
+from utils.http_client import http_client
+from utils.lyrics_store import lyrics_store
+from utils.lyrics_parser import LyricsStreamExtractor
 
 logger = logging.getLogger('discord_bot.lyrics_fetcher')
 
+# Bytes read from the network per step when scraping a lyrics page
+SCRAPE_CHUNK_SIZE = 16 * 1024
+
+# How long to remember that a song has no lyrics, so repeat requests don't hit Genius again
+NO_RESULTS_TTL = 10 * 60  # Search returned no hits
+NOT_EXTRACTED_TTL = 30 * 60  # Song page had no lyrics we could extract
+
+LYRICS_NOT_EXTRACTED = "Lyrics not found (could not extract from page)"
+
+class LyricsServiceUnavailable(Exception):
+    """Raised when the lyrics backend is failing and the circuit breaker is open."""
+    pass
+
+# Fail fast while Genius is erroring or timing out, probing again after a cool-down
+genius_breaker = CircuitBreaker("genius", failure_threshold=5, recovery_timeout=60)
+
 class LyricsCache:
-    """Simple in-memory cache for lyrics to avoid repeated API calls."""
-    def __init__(self, max_size=100, expiry_time=3600):  # Cache entries expire after 1 hour
-        self.cache = {}
-        self.max_size = max_size
-        self.expiry_time = expiry_time
+    """
+    In-memory LRU cache for lyrics to avoid repeated API calls.
+    
+    Entries are kept in an OrderedDict in least-recently-used order, so lookups,
+    inserts and evictions are all O(1). Each entry carries its own expiry time,
+    and the cache is bounded by the approximate size of the stored results
+    rather than by entry count, since lyrics vary from a few hundred bytes to
+    several KB. A background task periodically drops expired entries.
+    """
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024, expiry_time: int = 3600, sweep_interval: int = 300):
+        self.cache: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()  # {key: (expires_at, size, value)}
+        self.max_bytes = max_bytes
+        self.expiry_time = expiry_time  # Default TTL in seconds (1 hour)
+        self.sweep_interval = sweep_interval
+        self.current_bytes = 0
+        
+        # Counters for metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        self._sweep_task: Optional[asyncio.Task] = None
+    
+    @staticmethod
+    def _estimate_size(key: str, value: Dict[str, Any]) -> int:
+        """Approximate the memory footprint of an entry in bytes."""
+        return len(key) + len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+    
+    def _delete(self, key: str) -> None:
+        """Remove an entry and release its size from the budget."""
+        _, size, _ = self.cache.pop(key)
+        self.current_bytes -= size
     
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Get item from cache if it exists and is not expired."""
-        if key in self.cache:
-            timestamp, data = self.cache[key]
-            if time.time() - timestamp < self.expiry_time:
-                return data
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, _, data = entry
+        if time.time() >= expires_at:
             # Remove expired entry
-            del self.cache[key]
-        return None
+            self._delete(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        # Mark as most recently used
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return data
     
-    def set(self, key: str, value: Dict[str, Any]) -> None:
-        """Add item to cache with current timestamp."""
-        # If cache is full, remove oldest entry
-        if len(self.cache) >= self.max_size:
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][0])
-            del self.cache[oldest_key]
-        self.cache[key] = (time.time(), value)
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Add item to cache, evicting least recently used entries if over budget."""
+        size = self._estimate_size(key, value)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching lyrics for {key}: entry larger than cache budget")
+            return
+        
+        if key in self.cache:
+            self._delete(key)
+        
+        expires_at = time.time() + (self.expiry_time if ttl is None else ttl)
+        self.cache[key] = (expires_at, size, value)
+        self.current_bytes += size
+        
+        # Evict from the least recently used end until we're back under budget
+        while self.current_bytes > self.max_bytes:
+            oldest_key = next(iter(self.cache))
+            self._delete(oldest_key)
+            self.evictions += 1
+        
+        self._ensure_sweeper()
+    
+    def sweep(self) -> int:
+        """Remove all expired entries. Returns the number of entries removed."""
+        now = time.time()
+        expired = [key for key, (expires_at, _, _) in self.cache.items() if now >= expires_at]
+        for key in expired:
+            self._delete(key)
+        self.expirations += len(expired)
+        return len(expired)
+    
+    def _ensure_sweeper(self) -> None:
+        """Start the background expiry task on the running event loop, if any."""
+        if self._sweep_task is not None and not self._sweep_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not inside an event loop (e.g. used from a script); expired entries are still dropped on read
+            return
+        self._sweep_task = loop.create_task(self._sweep_loop())
+    
+    async def _sweep_loop(self) -> None:
+        """Periodically drop expired entries so they don't hold memory until read."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            removed = self.sweep()
+            if removed:
+                logger.debug(f"Lyrics cache sweep removed {removed} expired entries")
+    
+    def stop_sweeper(self) -> None:
+        """Cancel the background expiry task."""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.cache.clear()
+        self.current_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.cache),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+    
+    def __contains__(self, key: str) -> bool:
+        """Check for a live entry without touching LRU order or counters."""
+        entry = self.cache.get(key)
+        return entry is not None and time.time() < entry[0]
+    
+    def __len__(self) -> int:
+        return len(self.cache)
 
 # Initialize global cache
 lyrics_cache = LyricsCache()
 
-async def fetch_lyrics(query: str, api_key: Optional[str] = None) -> Dict[str, Any]:
+def _cache_key(store_key: str, api_key: Optional[str]) -> str:
+    """Build the in-memory cache key for a normalised query."""
+    return f"{store_key}:{api_key is not None}"
+
+# Genius lookups currently in flight, so concurrent requests for the same song share one fetch
+_inflight_lookups: Dict[str, asyncio.Task] = {}
+
+async def _fetch_from_genius_shared(key: str, query: str, api_key: str,
+                                    session: Optional[aiohttp.ClientSession]) -> Dict[str, Any]:
+    """Run fetch_from_genius, joining an identical lookup that is already in progress."""
+    task = _inflight_lookups.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch_from_genius(query, api_key, session))
+        _inflight_lookups[key] = task
+        
+        def _done(finished: asyncio.Task) -> None:
+            if _inflight_lookups.get(key) is finished:
+                del _inflight_lookups[key]
+        
+        task.add_done_callback(_done)
+    
+    # Shield so a cancelled waiter (e.g. a dropped prefetch) doesn't cancel the shared lookup
+    return await asyncio.shield(task)
+
+async def fetch_lyrics(query: str, api_key: Optional[str] = None,
+                       session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
     """
     Fetch lyrics for a song using the Genius API.
     
+    Lookups go through the in-memory cache, then the on-disk lyrics store,
+    and only then the network.
+    
     Args:
         query: Song name to search for
         api_key: Optional Genius API key
+        session: Optional HTTP session; defaults to the shared bot-wide session
     
     Returns:
         Dictionary containing lyrics, title, and artist information
     """
+    # Clean the query
+    cleaned_query = clean_query(query)
+    store_key = cleaned_query.lower()
+    
     # Check cache first
-    cache_key = f"{query}:{api_key is not None}"
+    cache_key = _cache_key(store_key, api_key)
     cached_result = lyrics_cache.get(cache_key)
     if cached_result:
         logger.info(f"Lyrics cache hit for: {query}")
         return cached_result
     
-    # Clean the query
-    cleaned_query = clean_query(query)
-    
     # Try to use Genius API if a key is provided
     if api_key:
+        # Check the persistent store before going to the network
+        stored_result = await lyrics_store.get(store_key)
+        if stored_result:
+            logger.info(f"Lyrics store hit for: {query}")
+            lyrics_cache.set(cache_key, stored_result)
+            return stored_result
+        
         try:
-            result = await fetch_from_genius(cleaned_query, api_key)
-            # Cache successful result
-            lyrics_cache.set(cache_key, result)
+            result = await _fetch_from_genius_shared(cache_key, cleaned_query, api_key, session)
+            lyrics = result["lyrics"]
+            if result.get("source") == "Genius (No Results)":
+                # Negative entry: remember the miss briefly
+                lyrics_cache.set(cache_key, result, ttl=NO_RESULTS_TTL)
+            elif lyrics == LYRICS_NOT_EXTRACTED:
+                lyrics_cache.set(cache_key, result, ttl=NOT_EXTRACTED_TTL)
+            elif not lyrics.startswith("Lyrics not found"):
+                # Cache successful result; transient scrape failures are not cached
+                lyrics_cache.set(cache_key, result)
+                if result.get("song_id"):
+                    lyrics_store.put(store_key, result["song_id"], result)
             return result
+        except LyricsServiceUnavailable as e:
+            logger.warning(f"Skipping Genius lookup for {query}: {e}")
+            return {
+                "lyrics": "",
+                "title": query,
+                "artist": "Unknown",
+                "error": str(e),
+                "source": "Genius (Unavailable)"
+            }
         except Exception as e:
             logger.error(f"Error using Genius API: {e}")
             # Fall back to alternative method if Genius fails
@@ -87,6 +278,67 @@ async def fetch_lyrics(query: str, api_key: Optional[str] = None) -> Dict[str, A
         }
         return error_result
 
+class LyricsPrefetcher:
+    """
+    Background warm-up of the lyrics cache for songs that are about to be requested.
+    
+    Prefetches wait a short delay so they don't compete with starting playback,
+    run with a small concurrency cap, and are skipped when the lyrics are already
+    cached or a prefetch for the same query is pending.
+    """
+    def __init__(self, max_concurrency: int = 2, delay: float = 2.0, max_pending: int = 20):
+        self.delay = delay  # Seconds to wait before starting a prefetch
+        self.max_pending = max_pending  # Prefetches beyond this are dropped
+        self.max_concurrency = max_concurrency
+        # One semaphore per event loop: main.py starts a new loop on every reconnect
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._tasks: Dict[str, asyncio.Task] = {}  # {query: task}
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency cap for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+    
+    def schedule(self, query: str, api_key: Optional[str]) -> None:
+        """Start fetching lyrics for query in the background. Must be called from the event loop."""
+        if not api_key or not query or query in self._tasks or len(self._tasks) >= self.max_pending:
+            return
+        
+        if _cache_key(clean_query(query).lower(), api_key) in lyrics_cache:
+            return
+        
+        task = asyncio.get_running_loop().create_task(self._prefetch(query, api_key))
+        self._tasks[query] = task
+        task.add_done_callback(lambda _: self._tasks.pop(query, None))
+    
+    async def _prefetch(self, query: str, api_key: str) -> None:
+        await asyncio.sleep(self.delay)
+        async with self._semaphore():
+            try:
+                await fetch_lyrics(query, api_key=api_key)
+                logger.debug(f"Prefetched lyrics for: {query}")
+            except Exception as e:
+                logger.debug(f"Lyrics prefetch failed for {query}: {e}")
+    
+    def cancel_all(self) -> None:
+        """Cancel all pending prefetches."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+
+# Initialize global prefetcher
+lyrics_prefetcher = LyricsPrefetcher()
+
+def lyrics_metrics() -> Dict[str, Any]:
+    """Return lyrics cache counters and Genius circuit breaker state."""
+    return {
+        "cache": lyrics_cache.stats(),
+        "genius_breaker": genius_breaker.stats()
+    }
+
 def clean_query(query: str) -> str:
     """Clean up the search query for better results."""
     # Remove common keywords that might interfere with lyrics search
@@ -101,128 +353,129 @@ def clean_query(query: str) -> str:
     
     return query
 
-async def fetch_from_genius(query: str, api_key: str) -> Dict[str, Any]:
+async def fetch_from_genius(query: str, api_key: str,
+                            session: Optional[aiohttp.ClientSession] = None) -> Dict[str, Any]:
     """Fetch lyrics using the Genius API."""
+    if not genius_breaker.allow_request():
+        raise LyricsServiceUnavailable(
+            f"Genius is temporarily unavailable. Try again in {int(genius_breaker.retry_after()) + 1} seconds."
+        )
+    
+    # Reuse the pooled session so repeated lookups skip DNS and TCP/TLS setup
+    session = session or http_client.session
+    
     # First, search for the song
-    search_url = f"https://api.genius.com/search?q={query}"
+    search_url = "https://api.genius.com/search"
     
-    async with aiohttp.ClientSession() as session:
-        # Add timeout to prevent hanging
-        try:
-            async with session.get(
-                search_url,
-                headers={"Authorization": f"Bearer {api_key}"},
-                timeout=10
-            ) as resp:
-                if resp.status != 200:
-                    error_msg = await resp.text()
-                    logger.warning(f"Genius API search failed: {resp.status} - {error_msg}")
-                    raise Exception(f"Failed to search for lyrics: Status {resp.status}")
-                
-                data = await resp.json()
-                
-                # Check if we got any hits
-                hits = data.get('response', {}).get('hits', [])
-                if not hits:
-                    return {
-                        "lyrics": f"No lyrics found for '{query}'", 
-                        "title": query, 
-                        "artist": "Unknown",
-                        "source": "Genius (No Results)"
-                    }
-                
-                # Get the top result
-                top_hit = hits[0]['result']
-                
-                song_id = top_hit['id']
-                song_title = top_hit['title']
-                artist_name = top_hit['primary_artist']['name']
-                song_url = top_hit['url']
-                
-                thumbnail = None
-                if 'song_art_image_thumbnail_url' in top_hit:
-                    thumbnail = top_hit['song_art_image_thumbnail_url']
-                
-                # Now fetch the lyrics from the song page
-                lyrics = await scrape_lyrics_from_genius(song_url, session)
-                
-                # Get a list of alternative matches for better user experience
-                alternatives = []
-                for i, hit in enumerate(hits[1:4]):  # Get next 3 hits as alternatives
-                    result = hit['result']
-                    alternatives.append({
-                        "title": result['title'],
-                        "artist": result['primary_artist']['name'],
-                        "url": result['url']
-                    })
-                
-                return {
-                    "lyrics": lyrics,
-                    "title": song_title,
-                    "artist": artist_name,
-                    "source": "Genius",
-                    "url": song_url,
-                    "thumbnail": thumbnail,
-                    "alternatives": alternatives
-                }
-        except asyncio.TimeoutError:
-            raise Exception("Request to Genius API timed out. Please try again later.")
-
-async def scrape_lyrics_from_genius(url: str, session: aiohttp.ClientSession) -> str:
+    # Timeouts come from the shared session's configuration
+    try:
+        async with session.get(
+            search_url,
+            params={"q": query},
+            headers={"Authorization": f"Bearer {api_key}"}
+        ) as resp:
+            if resp.status != 200:
+                error_msg = await resp.text()
+                logger.warning(f"Genius API search failed: {resp.status} - {error_msg}")
+                genius_breaker.record_failure()
+                raise Exception(f"Failed to search for lyrics: Status {resp.status}")
+            
+            data = await resp.json()
+        
+        genius_breaker.record_success()
+        
+        # Check if we got any hits
+        hits = data.get('response', {}).get('hits', [])
+        if not hits:
+            return {
+                "lyrics": f"No lyrics found for '{query}'", 
+                "title": query, 
+                "artist": "Unknown",
+                "source": "Genius (No Results)"
+            }
+        
+        # Get the top result
+        top_hit = hits[0]['result']
+        
+        song_id = top_hit['id']
+        song_title = top_hit['title']
+        artist_name = top_hit['primary_artist']['name']
+        song_url = top_hit['url']
+        
+        thumbnail = None
+        if 'song_art_image_thumbnail_url' in top_hit:
+            thumbnail = top_hit['song_art_image_thumbnail_url']
+        
+        # Reuse lyrics already stored for this song (e.g. found via a different query)
+        stored_result = await lyrics_store.get_by_song_id(song_id)
+        if stored_result:
+            lyrics = stored_result["lyrics"]
+        else:
+            # Now fetch the lyrics from the song page
+            lyrics = await scrape_lyrics_from_genius(song_url, session)
+        
+        # Get a list of alternative matches for better user experience
+        alternatives = []
+        for i, hit in enumerate(hits[1:4]):  # Get next 3 hits as alternatives
+            result = hit['result']
+            alternatives.append({
+                "title": result['title'],
+                "artist": result['primary_artist']['name'],
+                "url": result['url']
+            })
+        
+        return {
+            "lyrics": lyrics,
+            "title": song_title,
+            "artist": artist_name,
+            "source": "Genius",
+            "song_id": song_id,
+            "url": song_url,
+            "thumbnail": thumbnail,
+            "alternatives": alternatives
+        }
+    except asyncio.TimeoutError:
+        genius_breaker.record_failure()
+        raise Exception("Request to Genius API timed out. Please try again later.")
+    except aiohttp.ClientError as e:
+        genius_breaker.record_failure()
+        raise Exception(f"Could not reach the Genius API: {e}")
+
+async def scrape_lyrics_from_genius(url: str, session: Optional[aiohttp.ClientSession] = None) -> str:
     """Scrape lyrics from Genius song page."""
+    session = session or http_client.session
     try:
-        async with session.get(url, timeout=10) as resp:
+        async with session.get(url) as resp:
             if resp.status != 200:
+                if resp.status >= 500 or resp.status == 429:
+                    genius_breaker.record_failure()
                 return "Lyrics not found (error accessing page)"
             
-            html_content = await resp.text()
-            
-            # Improved pattern matching to extract lyrics
-            # Try multiple patterns to be more robust to HTML structure changes
-            lyrics_patterns = [
-                r'<div data-lyrics-container="true".*?>(.*?)</div>',
-                r'<div class="lyrics">(.*?)</div>',
-                r'<div class="Lyrics__Container-.*?>(.*?)</div>'
-            ]
-            
-            lyrics_text = None
-            for pattern in lyrics_patterns:
-                matches = re.findall(pattern, html_content, re.DOTALL)
-                if matches:
-                    # Join all matching containers (some lyrics are split into multiple containers)
-                    lyrics_html = "".join(matches)
-                    
-                    # Process the HTML
-                    lyrics_text = process_lyrics_html(lyrics_html)
+            # Parse the page as it arrives and stop reading once the lyrics section is over,
+            # instead of downloading the whole page and running regexes over it. This keeps
+            # peak memory low and can end the download early, but costs somewhat more CPU per
+            # page (about 0.79 ms vs 0.60 ms on benchmarks/lyrics_extraction.py's synthetic page)
+            decoder = codecs.getincrementaldecoder(resp.charset or 'utf-8')(errors='replace')
+            extractor = LyricsStreamExtractor()
+            async for chunk in resp.content.iter_chunked(SCRAPE_CHUNK_SIZE):
+                if extractor.feed(decoder.decode(chunk)):
                     break
+            else:
+                extractor.feed(decoder.decode(b'', final=True))
             
+            lyrics_text = extractor.result()
             if lyrics_text:
                 return lyrics_text
             
-            return "Lyrics not found (could not extract from page)"
+            return LYRICS_NOT_EXTRACTED
     except asyncio.TimeoutError:
+        genius_breaker.record_failure()
         return "Lyrics not found (request timed out)"
     except Exception as e:
+        genius_breaker.record_failure()
         logger.error(f"Error scraping lyrics: {e}")
         return f"Lyrics not found (error: {str(e)})"
 
-def process_lyrics_html(lyrics_html: str) -> str:
-    """Process lyrics HTML to get clean text."""
-    # Replace <br> tags with newlines
-    lyrics = re.sub(r'<br\s*/?>', '\n', lyrics_html)
-    
-    # Remove all other HTML tags
-    lyrics = re.sub(r'<[^>]+>', '', lyrics)
-    
-    # Decode HTML entities
-    lyrics = html.unescape(lyrics)
-    
-    # Fix newlines and clean up
-    lyrics = re.sub(r'\n{3,}', '\n\n', lyrics)
-    lyrics = lyrics.strip()
-    
-    return lyrics
-
 async def fetch_from_alternative_source(query: str) -> Dict[str, Any]:
     """
     Fetch lyrics from an alternative source when Genius API is not available.
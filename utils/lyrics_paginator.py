@@ -0,0 +1,137 @@
+import discord
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('discord_bot.lyrics_paginator')
+
+# Default page size, leaving room under Discord's 4096-character embed description limit
+PAGE_SIZE = 1800
+
+STANZA_BREAK = re.compile(r'\n\s*\n')
+
+def _split_long_stanza(stanza: str, max_chars: int) -> List[str]:
+    """Split a stanza that doesn't fit on one page at line boundaries (or hard-wrap very long lines)."""
+    pieces = []
+    lines: List[str] = []
+    size = 0
+    
+    for line in stanza.split('\n'):
+        while len(line) > max_chars:
+            if lines:
+                pieces.append('\n'.join(lines))
+                lines, size = [], 0
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        
+        extra = len(line) + (1 if lines else 0)
+        if lines and size + extra > max_chars:
+            pieces.append('\n'.join(lines))
+            lines, size = [], 0
+            extra = len(line)
+        lines.append(line)
+        size += extra
+    
+    if lines:
+        pieces.append('\n'.join(lines))
+    return pieces
+
+@lru_cache(maxsize=128)
+def paginate_lyrics(lyrics: str, max_chars: int = PAGE_SIZE) -> Tuple[str, ...]:
+    """
+    Split lyrics into pages of at most max_chars, keeping stanzas together where possible.
+    
+    Runs in a single pass over the stanzas and builds each page with one join.
+    Results are cached per lyrics text, so paging through the same song again
+    (or another user requesting it) doesn't re-split it.
+    """
+    pages = []
+    current: List[str] = []
+    size = 0
+    
+    for stanza in STANZA_BREAK.split(lyrics.strip()):
+        stanza = stanza.strip('\n')
+        if not stanza:
+            continue
+        
+        pieces = [stanza] if len(stanza) <= max_chars else _split_long_stanza(stanza, max_chars)
+        for piece in pieces:
+            extra = len(piece) + (2 if current else 0)
+            if current and size + extra > max_chars:
+                pages.append('\n\n'.join(current))
+                current, size = [], 0
+                extra = len(piece)
+            current.append(piece)
+            size += extra
+    
+    if current:
+        pages.append('\n\n'.join(current))
+    
+    return tuple(pages) or ("No lyrics found",)
+
+class LyricsPaginator(discord.ui.View):
+    """
+    Shows a list of lyrics pages in a single message with previous/next buttons.
+    
+    Turning a page edits the message in place instead of sending a new one.
+    """
+    
+    def __init__(self, pages: Sequence[str], make_embed: Callable[[str, int, int], discord.Embed],
+                 author_id: Optional[int] = None, timeout: float = 300):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.make_embed = make_embed  # Builds the embed for (page_text, page_index, page_count)
+        self.author_id = author_id  # Only this user may turn pages (None = anyone)
+        self.index = 0
+        self.message: Optional[discord.Message] = None
+        self._update_buttons()
+    
+    def current_embed(self) -> discord.Embed:
+        """Build the embed for the page currently shown."""
+        return self.make_embed(self.pages[self.index], self.index, len(self.pages))
+    
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index >= len(self.pages) - 1
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.author_id is not None and interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "Only the person who requested these lyrics can turn the pages.", ephemeral=True
+            )
+            return False
+        return True
+    
+    async def _show(self, interaction: discord.Interaction) -> None:
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.current_embed(), view=self)
+    
+    @discord.ui.button(label="Previous", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.index = max(0, self.index - 1)
+        await self._show(interaction)
+    
+    @discord.ui.button(label="Next", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.index = min(len(self.pages) - 1, self.index + 1)
+        await self._show(interaction)
+    
+    async def on_timeout(self) -> None:
+        """Disable the buttons once the paginator stops listening."""
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+    
+    async def send(self, destination: discord.abc.Messageable) -> discord.Message:
+        """Send the first page; buttons are only attached when there is more than one page."""
+        if len(self.pages) > 1:
+            self.message = await destination.send(embed=self.current_embed(), view=self)
+        else:
+            self.stop()
+            self.message = await destination.send(embed=self.current_embed())
+        return self.message
@@ -0,0 +1,175 @@
+import html
+import re
+from typing import List, Optional
+
+# Attributes that mark the start of a lyrics block on a Genius song page
+LYRICS_MARKERS = ('data-lyrics-container="true"', 'class="lyrics"')
+
+# Genius marks headers, ads and embeds inside the lyrics container with this attribute
+EXCLUDE_MARKER = 'data-exclude-from-selection="true"'
+
+# Tags that never have a closing tag
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+})
+
+# A complete tag or comment; group 1 is "/" for closing tags, group 2 the tag name, group 3 the attributes
+TAG_PATTERN = re.compile(r'<!--.*?-->|<(/?)([a-zA-Z][a-zA-Z0-9-]*)([^>]*)>', re.DOTALL)
+
+class LyricsStreamExtractor:
+    """
+    Incrementally extract lyrics text from a Genius song page.
+    
+    Text outside lyrics containers is skipped with plain substring searches, and
+    only the container subtrees are tokenised. Once at least one container has
+    closed and no new one starts within `lookahead` characters, the extractor
+    reports that it is done so the caller can stop reading the response.
+    
+    Usage:
+        extractor = LyricsStreamExtractor()
+        for chunk in chunks:
+            if extractor.feed(chunk):
+                break
+        lyrics = extractor.result()
+    """
+    
+    def __init__(self, lookahead: int = 32 * 1024, max_chars: int = 4 * 1024 * 1024):
+        self.lookahead = lookahead  # Characters to scan past the last container before giving up
+        self.max_chars = max_chars  # Hard limit on characters read from the page
+        self.done = False
+        self.containers = 0  # Number of lyrics containers found so far
+        self._parts: List[str] = []
+        self._depth = 0  # Element depth inside the current container (0 = scanning for a container)
+        self._exclude_depth = 0  # Depth at which an excluded subtree started (0 = none)
+        self._pending = ""  # Unprocessed text carried over between chunks
+        self._chars_read = 0
+        self._chars_since_container = 0
+    
+    @staticmethod
+    def _find_container(text: str, pos: int) -> int:
+        """Return the index of the tag that opens the next lyrics container at or after pos, or -1."""
+        best = -1
+        for marker in LYRICS_MARKERS:
+            index = text.find(marker, pos)
+            if index != -1 and (best == -1 or index < best):
+                best = index
+        if best == -1:
+            return -1
+        return max(text.rfind("<", pos, best), pos)
+    
+    def _scan_container(self, text: str, pos: int) -> int:
+        """
+        Consume tags and text inside a container starting at pos.
+        
+        Returns the position after the container's closing tag, or -1 if the
+        text ran out first (the unconsumed tail is kept for the next chunk).
+        """
+        while True:
+            match = TAG_PATTERN.search(text, pos)
+            if match is None:
+                # Keep a partial tag for the next chunk; plain text can be emitted now
+                cut = text.find("<", pos)
+                if cut == -1:
+                    cut = len(text)
+                if not self._exclude_depth:
+                    self._parts.append(text[pos:cut])
+                self._pending = text[cut:]
+                return -1
+            
+            if match.start() > pos and not self._exclude_depth:
+                self._parts.append(text[pos:match.start()])
+            pos = match.end()
+            
+            tag = match.group(2)
+            if tag is None:
+                # Comment
+                continue
+            tag = tag.lower()
+            
+            if match.group(1):
+                if tag in VOID_TAGS:
+                    continue
+                if self._exclude_depth == self._depth:
+                    self._exclude_depth = 0
+                self._depth -= 1
+                if self._depth == 0:
+                    return pos
+                continue
+            
+            attrs = match.group(3)
+            if tag == "br":
+                if not self._exclude_depth:
+                    self._parts.append("\n")
+                continue
+            if tag in VOID_TAGS or attrs.endswith("/"):
+                continue
+            
+            self._depth += 1
+            if not self._exclude_depth and EXCLUDE_MARKER in attrs:
+                self._exclude_depth = self._depth
+    
+    def feed(self, chunk: str) -> bool:
+        """Feed the next piece of the page. Returns True once no more input is needed."""
+        if self.done:
+            return True
+        
+        self._chars_read += len(chunk)
+        if self.containers and not self._depth:
+            self._chars_since_container += len(chunk)
+        
+        text = self._pending + chunk
+        self._pending = ""
+        pos = 0
+        
+        while pos < len(text):
+            if self._depth:
+                pos = self._scan_container(text, pos)
+                if pos == -1:
+                    break
+                self._chars_since_container = 0
+                continue
+            
+            start = self._find_container(text, pos)
+            if start == -1:
+                # Keep the tail in case a marker is split across chunks
+                self._pending = text[max(pos, len(text) - 256):]
+                break
+            
+            # Step over the opening tag itself
+            end = text.find(">", start)
+            if end == -1:
+                self._pending = text[start:]
+                break
+            
+            if self._parts:
+                # Keep stanzas from separate containers apart
+                self._parts.append("\n")
+            self.containers += 1
+            self._depth = 1
+            pos = end + 1
+        
+        if self.containers and not self._depth and self._chars_since_container > self.lookahead:
+            self.done = True
+        elif self._chars_read >= self.max_chars:
+            self.done = True
+        
+        return self.done
+    
+    def result(self) -> Optional[str]:
+        """Return the cleaned lyrics text, or None if no lyrics container was found."""
+        if not self.containers:
+            return None
+        
+        lyrics = html.unescape("".join(self._parts))
+        lyrics = re.sub(r'[ \t]+\n', '\n', lyrics)
+        lyrics = re.sub(r'\n{3,}', '\n\n', lyrics)
+        return lyrics.strip() or None
+
+def extract_lyrics(html_content: str, chunk_size: int = 64 * 1024) -> Optional[str]:
+    """Extract lyrics from a complete page by feeding it through LyricsStreamExtractor."""
+    extractor = LyricsStreamExtractor()
+    for i in range(0, len(html_content), chunk_size):
+        if extractor.feed(html_content[i:i + chunk_size]):
+            break
+    return extractor.result()
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger('discord_bot.lyrics_store')
+
+class LyricsStore:
+    """
+    Disk-backed lyrics store that survives bot restarts.
+    
+    Results are stored zlib-compressed in SQLite, keyed by Genius song ID, with a
+    second table mapping normalised search queries to song IDs. All database work
+    runs on a single background thread so the event loop never blocks on disk I/O,
+    and writes are buffered and committed in batches.
+    """
+    
+    def __init__(self, db_path: str = "data/lyrics.db", flush_interval: float = 5.0,
+                 max_batch: int = 50, max_age: int = 30 * 24 * 3600):
+        self.db_path = db_path
+        self.flush_interval = flush_interval  # Seconds to wait before writing buffered entries
+        self.max_batch = max_batch  # Flush immediately once this many entries are buffered
+        self.max_age = max_age  # Stored lyrics older than this are treated as missing
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lyrics-store")
+        self._pending: Dict[str, Tuple[int, Dict[str, Any]]] = {}  # {query_key: (song_id, result)}
+        self._writing: Dict[str, Tuple[int, Dict[str, Any]]] = {}  # Batch currently being committed
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema (runs on the store thread)."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS songs ("
+                "song_id INTEGER PRIMARY KEY, "
+                "payload BLOB NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                "query_key TEXT PRIMARY KEY, "
+                "song_id INTEGER NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    @staticmethod
+    def _compress(result: Dict[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(result, ensure_ascii=False).encode('utf-8'), 6)
+    
+    @staticmethod
+    def _decompress(payload: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+    
+    async def _run(self, func, *args):
+        """Run a database function on the store thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def _read(self, sql: str, key) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute(sql, (key,)).fetchone()
+        if row is None:
+            return None
+        payload, updated_at = row
+        if time.time() - updated_at > self.max_age:
+            return None
+        return self._decompress(payload)
+    
+    async def get(self, query_key: str) -> Optional[Dict[str, Any]]:
+        """Look up stored lyrics by normalised query."""
+        pending = self._pending.get(query_key) or self._writing.get(query_key)
+        if pending is not None:
+            return pending[1]
+        try:
+            return await self._run(
+                self._read,
+                "SELECT s.payload, s.updated_at FROM queries q JOIN songs s ON s.song_id = q.song_id "
+                "WHERE q.query_key = ?",
+                query_key
+            )
+        except Exception as e:
+            logger.error(f"Error reading lyrics store: {e}")
+            return None
+    
+    async def get_by_song_id(self, song_id: int) -> Optional[Dict[str, Any]]:
+        """Look up stored lyrics by Genius song ID."""
+        for pending_id, result in [*self._pending.values(), *self._writing.values()]:
+            if pending_id == song_id:
+                return result
+        try:
+            return await self._run(self._read, "SELECT payload, updated_at FROM songs WHERE song_id = ?", song_id)
+        except Exception as e:
+            logger.error(f"Error reading lyrics store: {e}")
+            return None
+    
+    def put(self, query_key: str, song_id: int, result: Dict[str, Any]) -> None:
+        """
+        Buffer a result for writing.
+        
+        The write happens in the background; call from inside the event loop.
+        """
+        self._pending[query_key] = (song_id, result)
+        
+        if len(self._pending) >= self.max_batch:
+            asyncio.get_running_loop().create_task(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._delayed_flush())
+    
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+    
+    def _write_batch(self, batch: Dict[str, Tuple[int, Dict[str, Any]]]) -> None:
+        conn = self._connect()
+        now = time.time()
+        songs = {}
+        for song_id, result in batch.values():
+            songs[song_id] = self._compress(result)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO songs (song_id, payload, updated_at) VALUES (?, ?, ?)",
+                [(song_id, payload, now) for song_id, payload in songs.items()]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO queries (query_key, song_id) VALUES (?, ?)",
+                [(query_key, song_id) for query_key, (song_id, _) in batch.items()]
+            )
+    
+    async def flush(self) -> None:
+        """Write all buffered entries in a single transaction."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._writing.update(batch)
+        try:
+            await self._run(self._write_batch, batch)
+            logger.debug(f"Wrote {len(batch)} lyrics entries to disk")
+        except Exception as e:
+            logger.error(f"Error writing lyrics store: {e}")
+        finally:
+            for query_key in batch:
+                self._writing.pop(query_key, None)
+    
+    async def close(self) -> None:
+        """Flush buffered writes and close the database."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        await self.flush()
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+
+# Initialize global store
+lyrics_store = LyricsStore()
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Callable, List, Optional
 import time
 
 class Song:
@@ -6,7 +6,8 @@ class Song:
     
     def __init__(self, title: str, url: Optional[str], duration: Optional[int] = None,
                  webpage_url: Optional[str] = None, thumbnail: Optional[str] = None,
-                 uploader: str = "Unknown", is_spotify: bool = False, search_query: Optional[str] = None):
+                 uploader: str = "Unknown", is_spotify: bool = False, search_query: Optional[str] = None,
+                 requester_id: Optional[int] = None):
         self.title = title  # Song title
         self.url = url  # Direct audio URL for playback
         self.duration = duration  # Duration in seconds
@@ -15,6 +16,7 @@ class Song:
         self.uploader = uploader  # Name of the uploader (e.g., YouTube channel)
         self.is_spotify = is_spotify  # Whether this song is from Spotify
         self.search_query = search_query  # Search query for Spotify songs to find on YouTube
+        self.requester_id = requester_id  # Discord ID of the user who queued the song
         self.added_at = time.time()  # Time when the song was added to the queue
     
     def __str__(self):
@@ -79,6 +81,93 @@ class MusicQueue:
             return song
         return None
     
+    def remove_range(self, start: int, end: int) -> List[Song]:
+        """
+        Remove songs[start:end] in a single slice deletion.
+        
+        If the current song falls inside the range, the pointer moves to the
+        first song after the removed block.
+        """
+        start = max(0, start)
+        end = min(len(self.songs), end)
+        if start >= end:
+            return []
+        
+        removed = self.songs[start:end]
+        del self.songs[start:end]
+        
+        # Adjust current_index if necessary
+        if self.current_index >= end:
+            self.current_index -= end - start
+        elif self.current_index >= start:
+            self.current_index = start
+        
+        return removed
+    
+    def move(self, src: int, dst: int) -> Optional[Song]:
+        """Move the song at index src to index dst, shifting the songs in between."""
+        if not (0 <= src < len(self.songs) and 0 <= dst < len(self.songs)):
+            return None
+        
+        song = self.songs.pop(src)
+        self.songs.insert(dst, song)
+        
+        # Keep current_index pointing at the same song
+        if self.current_index == src:
+            self.current_index = dst
+        elif src < self.current_index <= dst:
+            self.current_index -= 1
+        elif dst <= self.current_index < src:
+            self.current_index += 1
+        
+        return song
+    
+    def remove_where(self, predicate: Callable[[Song], bool]) -> List[Song]:
+        """
+        Remove every song matching predicate.
+        
+        The queue is rebuilt in one pass, so the cost is linear in the queue
+        length rather than one list shift per removed song.
+        """
+        kept = []
+        removed = []
+        new_index = None
+        
+        for i, song in enumerate(self.songs):
+            if i == self.current_index:
+                new_index = len(kept)
+            if predicate(song):
+                removed.append(song)
+            else:
+                kept.append(song)
+        
+        if removed:
+            self.songs = kept
+            # If the pointer was past the end, keep it past the end
+            self.current_index = len(kept) if new_index is None else new_index
+        
+        return removed
+    
+    def dedupe(self) -> List[Song]:
+        """Remove repeated songs (same URL, or same title if there is no URL), keeping the first copy."""
+        seen = set()
+        
+        def is_duplicate(song: Song) -> bool:
+            key = song.webpage_url or song.title
+            if key in seen:
+                return True
+            seen.add(key)
+            return False
+        
+        return self.remove_where(is_duplicate)
+    
+    def skip_to(self, index: int) -> Optional[Song]:
+        """Point the queue at the song at index so it is the next one played."""
+        if 0 <= index < len(self.songs):
+            self.current_index = index
+            return self.songs[index]
+        return None
+    
     def shuffle(self) -> None:
         """Shuffle the queue (except the current song)."""
         import random
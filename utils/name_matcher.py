@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger('discord_bot.name_matcher')
+
+ALIASES_FILE = "data/aliases.json"
+
+NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+@lru_cache(maxsize=4096)
+def normalize(name: str) -> str:
+    """Fold accents and case, turn punctuation into spaces and collapse whitespace ("Beyoncé!" -> "beyonce")."""
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(c for c in folded if not unicodedata.combining(c)).casefold()
+    folded = folded.replace("&", " and ").replace("'", "").replace(".", "")
+    return NON_ALNUM.sub(" ", folded).strip()
+
+def compact(name: str) -> str:
+    """Normalised name without spaces, so "Shahrukh Khan" and "Shah Rukh Khan" compare equal."""
+    return normalize(name).replace(" ", "")
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein distance between a and b, or max_distance + 1 if it is larger.
+    
+    Only a band of width 2 * max_distance + 1 around the diagonal is computed,
+    and the computation stops as soon as the whole row exceeds the limit.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+    
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= max_distance else too_far
+        for j in range(low, high + 1):
+            cost = 0 if ca == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+        if min(current[low - 1:high + 1]) > max_distance:
+            return too_far
+        previous = current
+    return min(previous[len(b)], too_far)
+
+def allowed_distance(name: str) -> int:
+    """Typos tolerated for a name: 1 for short names, up to 3 for long ones."""
+    return max(1, min(3, len(compact(name)) // 5))
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+@lru_cache(maxsize=1)
+def load_aliases(path: str = ALIASES_FILE) -> Dict[str, Tuple[str, ...]]:
+    """Load {canonical name: [aliases]} from the aliases file (empty if it doesn't exist)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {compact(name): tuple(aliases) for name, aliases in data.items()}
+    except Exception as e:
+        logger.error(f"Error loading name aliases from {path}: {e}")
+        return {}
+
+class NameIndex:
+    """
+    Normalised lookup index over the names of one category.
+    
+    Exact lookups (after accent folding, punctuation stripping and known
+    aliases) are a dict hit. Fuzzy lookups use a trigram index to pick a few
+    candidates and only compute the edit distance for those, so they stay
+    fast for large categories.
+    """
+    
+    def __init__(self, names: Iterable[str], aliases: Optional[Dict[str, Tuple[str, ...]]] = None):
+        if aliases is None:
+            aliases = load_aliases()
+        self.names: List[str] = []
+        self._keys: List[str] = []  # Compact key of each entry (names and aliases)
+        self._entry_name: List[int] = []  # Entry -> index into self.names
+        self._exact: Dict[str, int] = {}  # Compact key -> index into self.names
+        self._trigrams: Dict[str, List[int]] = defaultdict(list)  # Trigram -> entries
+        
+        for name in names:
+            name_id = len(self.names)
+            self.names.append(name)
+            key = compact(name)
+            self._add_key(key, name_id)
+            for alias in aliases.get(key, ()):
+                self._add_key(compact(alias), name_id)
+    
+    def _add_key(self, key: str, name_id: int) -> None:
+        if not key or key in self._exact:
+            return
+        self._exact[key] = name_id
+        entry = len(self._keys)
+        self._keys.append(key)
+        self._entry_name.append(name_id)
+        for trigram in _trigrams(key):
+            self._trigrams[trigram].append(entry)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def lookup(self, guess: str) -> Optional[str]:
+        """Return the name the guess refers to exactly (modulo case, accents, punctuation and aliases)."""
+        name_id = self._exact.get(compact(guess))
+        return None if name_id is None else self.names[name_id]
+    
+    def closest(self, guess: str, limit: int = 3, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Return up to `limit` (name, distance) pairs within the edit-distance limit, closest first.
+        
+        By default max_distance is one more than allowed_distance(guess), since these are suggestions.
+        """
+        key = compact(guess)
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = allowed_distance(guess) + 1
+        
+        # Count shared trigrams (in C, via Counter) and only check the most promising candidates.
+        # By the q-gram lemma a string within max_distance edits shares at least this many trigrams.
+        grams = _trigrams(key)
+        min_shared = max(1, len(grams) - 3 * max_distance)
+        shared = Counter(chain.from_iterable(self._trigrams.get(trigram, ()) for trigram in grams))
+        candidates = [entry for entry, count in shared.most_common(max(limit * 5, 20)) if count >= min_shared]
+        
+        best: Dict[int, int] = {}
+        for entry in candidates:
+            distance = edit_distance(key, self._keys[entry], max_distance)
+            if distance <= max_distance:
+                name_id = self._entry_name[entry]
+                if distance < best.get(name_id, max_distance + 1):
+                    best[name_id] = distance
+        
+        ranked = sorted(best.items(), key=lambda item: item[1])[:limit]
+        return [(self.names[name_id], distance) for name_id, distance in ranked]
+    
+    def matches(self, guess: str, target: str) -> bool:
+        """
+        Return True if the guess should count as naming `target`.
+        
+        Accepts exact normalised matches and aliases, and typos within
+        allowed_distance(target) unless the guess is exactly another name.
+        """
+        exact = self.lookup(guess)
+        if exact is not None:
+            return compact(exact) == compact(target)
+        
+        if compact(guess) == compact(target):
+            return True
+        
+        aliases = load_aliases().get(compact(target), ())
+        keys = [compact(target)] + [compact(alias) for alias in aliases]
+        limit = allowed_distance(target)
+        return any(edit_distance(compact(guess), key, limit) <= limit for key in keys)
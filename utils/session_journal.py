@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, TextIO
+
+from utils.game_manager import GameSession, Player
+
+logger = logging.getLogger('discord_bot.session_journal')
+
+class SessionJournal:
+    """
+    Append-only journal of Guess It session changes, so games survive restarts.
+    
+    Every change (start, join, assign, guess, activity, end) is appended as one
+    compact JSON line and flushed straight away. Replaying the file rebuilds
+    the sessions. After `compact_every` records the file is rewritten as one
+    snapshot line per live session (temp file, fsync, rename), which keeps it
+    small and the replay fast.
+    
+    Records are built on the caller's thread, so they capture the session
+    as it is now, and written by one background thread in submission order;
+    compactions go through the same thread, so they never race an append.
+    """
+    
+    def __init__(self, path: str = "data/game_sessions.journal", compact_every: int = 500):
+        self.path = path
+        self.compact_every = compact_every
+        self._file: Optional[TextIO] = None
+        self._records_since_compaction = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-journal")
+    
+    def _open(self) -> TextIO:
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+    
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._records_since_compaction += 1
+        self._executor.submit(self._write, json.dumps(record, separators=(',', ':'), ensure_ascii=False))
+    
+    def _write(self, line: str) -> None:
+        try:
+            f = self._open()
+            f.write(line + "\n")
+            f.flush()
+        except OSError as e:
+            logger.error(f"Error writing session journal: {e}")
+    
+    def record_start(self, session: GameSession) -> None:
+        self._append({"t": "snapshot", "ts": session.last_activity, "s": session.to_dict()})
+    
+    def record_join(self, session: GameSession, player: Player) -> None:
+        self._append({"t": "join", "c": session.channel_id, "ts": session.last_activity,
+                      "u": player.id, "n": player.name})
+    
+    def record_leave(self, session: GameSession, player_id: int) -> None:
+        self._append({"t": "leave", "c": session.channel_id, "ts": session.last_activity, "u": player_id})
+    
+    def record_assign(self, session: GameSession) -> None:
+        self._append({"t": "assign", "c": session.channel_id, "ts": session.last_activity,
+                      "a": [[p.id, p.actor] for p in session.players.values()]})
+    
+    def record_guess(self, session: GameSession, player: Player) -> None:
+        self._append({"t": "guess", "c": session.channel_id, "ts": session.last_activity,
+                      "u": player.id, "ok": player.has_guessed_correctly})
+    
+    def record_activity(self, session: GameSession) -> None:
+        self._append({"t": "activity", "c": session.channel_id, "ts": session.last_activity})
+    
+    def record_end(self, channel_id: int) -> None:
+        self._append({"t": "end", "c": channel_id, "ts": time.time()})
+    
+    @staticmethod
+    def _apply(sessions: Dict[int, GameSession], record: Dict[str, Any]) -> None:
+        kind = record["t"]
+        if kind == "snapshot":
+            session = GameSession.from_dict(record["s"])
+            sessions[session.channel_id] = session
+            return
+        
+        session = sessions.get(record["c"])
+        if session is None:
+            return
+        if kind == "end":
+            del sessions[record["c"]]
+            return
+        
+        if kind == "join":
+            session.players[record["u"]] = Player(record["u"], record["n"])
+        elif kind == "leave":
+            session.remove_player(record["u"])
+        elif kind == "assign":
+            for player_id, actor in record["a"]:
+                player = session.players.get(player_id)
+                if player is not None:
+                    player.actor = actor
+            session.is_in_progress = True
+        elif kind == "guess":
+            player = session.players.get(record["u"])
+            if player is not None:
+                player.guess_count += 1
+                if record["ok"]:
+                    session.record_correct_guess(player)
+        session.last_activity = record["ts"]
+    
+    def load(self) -> Dict[int, GameSession]:
+        """Replay the journal and return the sessions it describes, keyed by channel ID (blocking)."""
+        sessions: Dict[int, GameSession] = {}
+        if not os.path.exists(self.path):
+            return sessions
+        
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    self._apply(sessions, json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    # Most likely a line cut short by a crash; skip it
+                    logger.warning(f"Skipping bad session journal line {number}: {e}")
+        
+        logger.info(f"Replayed session journal: {len(sessions)} sessions")
+        return sessions
+    
+    def compact(self, sessions: Dict[int, GameSession]) -> Future:
+        """
+        Rewrite the journal as one snapshot per live session.
+        
+        The snapshot is taken now; the rewrite runs on the writer thread
+        after any pending appends. Returns a future for the rewrite.
+        """
+        lines = [json.dumps({"t": "snapshot", "ts": session.last_activity, "s": session.to_dict()},
+                            separators=(',', ':'), ensure_ascii=False)
+                 for session in sessions.values()]
+        self._records_since_compaction = 0
+        return self._executor.submit(self._rewrite, lines)
+    
+    def _rewrite(self, lines: List[str]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for line in lines:
+                    f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            os.replace(tmp_path, self.path)
+            logger.debug(f"Compacted session journal to {len(lines)} sessions")
+        except OSError as e:
+            logger.error(f"Error compacting session journal: {e}")
+    
+    def maybe_compact(self, sessions: Dict[int, GameSession]) -> None:
+        """Schedule a compaction if enough records have been appended since the last one."""
+        if self._records_since_compaction >= self.compact_every:
+            self.compact(sessions)
+    
+    def close(self) -> None:
+        """Finish pending writes and close the journal (blocking)."""
+        self._executor.submit(self._close).result()
+    
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger('discord_bot.shuffle_bag')
+
+DEFAULT_STATE_FILE = "data/shuffle_bags.json"
+
+MASK64 = (1 << 64) - 1
+
+def _mix(value: int) -> int:
+    """SplitMix64 finaliser; a cheap, well-spread 64-bit hash that is the same in every process."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+def permute(index: int, size: int, seed: int) -> int:
+    """
+    Map index to its position in a pseudo-random permutation of range(size) chosen by seed.
+    
+    A four-round Feistel network permutes the smallest even-bit power of two
+    covering size; results outside range(size) are fed back in (cycle
+    walking), which takes fewer than four steps on average. Nothing is stored,
+    so dealing k items costs O(k) however large the category is.
+    """
+    half = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    value = index
+    while True:
+        left, right = value >> half, value & mask
+        for round_number in range(4):
+            left, right = right, left ^ (_mix(seed ^ (round_number << 56) ^ right) & mask)
+        value = (left << half) | right
+        if value < size:
+            return value
+
+class ShuffleBag:
+    """Position in one guild's shuffled pass through a category."""
+    
+    __slots__ = ("seed", "offset", "size")
+    
+    def __init__(self, size: int, seed: Optional[int] = None, offset: int = 0):
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.offset = offset  # Items of this round already dealt
+        self.size = size  # Category size the permutation was made for
+    
+    @property
+    def exhausted(self) -> bool:
+        return self.offset >= self.size
+    
+    def draw(self) -> int:
+        """Return the next item position of this round."""
+        position = permute(self.offset, self.size, self.seed)
+        self.offset += 1
+        return position
+
+class ShuffleBags:
+    """
+    Deals category items per guild without repeats until the category is used up.
+    
+    Each (guild, category) pair walks its own seeded permutation of the
+    category, so regular groups see every item once before any comes back.
+    Only the seed, offset and category size are persisted. When a round ends,
+    or the category changes size because items were added or removed, a new
+    round starts with a fresh seed.
+    """
+    
+    def __init__(self, path: str = DEFAULT_STATE_FILE):
+        self.path = path
+        self._bags: Optional[Dict[str, ShuffleBag]] = None
+        self._write_lock = threading.Lock()
+    
+    @staticmethod
+    def _key(guild_id: Optional[int], category: str) -> str:
+        return f"{guild_id}:{category.lower()}"
+    
+    def _load(self) -> Dict[str, ShuffleBag]:
+        if self._bags is None:
+            self._bags = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    self._bags = {key: ShuffleBag(size, seed, offset) for key, (seed, offset, size) in data.items()}
+                except Exception as e:
+                    logger.error(f"Error loading shuffle bags from {self.path}, starting fresh rounds: {e}")
+        return self._bags
+    
+    def bag(self, guild_id: Optional[int], category: str, size: int) -> ShuffleBag:
+        """Return the guild's bag for a category, starting a new round if the category changed size."""
+        bags = self._load()
+        key = self._key(guild_id, category)
+        bag = bags.get(key)
+        if bag is None or bag.size != size:
+            bag = bags[key] = ShuffleBag(size)
+        return bag
+    
+    def draw_positions(self, guild_id: Optional[int], category: str, size: int, k: int) -> List[int]:
+        """
+        Reserve up to k distinct item positions for a guild.
+        
+        When the round runs out part-way, the rest come from a new round,
+        skipping positions already drawn for this deal.
+        """
+        if size <= 0:
+            return []
+        bag = self.bag(guild_id, category, size)
+        positions: List[int] = []
+        seen = set()
+        while len(positions) < min(k, size):
+            if bag.exhausted:
+                logger.debug(f"Shuffle bag for {self._key(guild_id, category)} used up; starting a new round")
+                bag = self._bags[self._key(guild_id, category)] = ShuffleBag(size)
+            position = bag.draw()
+            if position not in seen:
+                seen.add(position)
+                positions.append(position)
+        return positions
+    
+    async def deal(self, catalog, guild_id: Optional[int], category: str, k: int) -> List[str]:
+        """
+        Deal k distinct items of a category from the guild's bag and persist the new offset.
+        
+        Returns an empty list and leaves the bag as it was if the category
+        has fewer than k items, so a rejected game start skips nothing.
+        """
+        if self._bags is None:
+            await asyncio.to_thread(self._load)
+        size = await catalog.count(category)
+        if size < k:
+            return []
+        
+        key = self._key(guild_id, category)
+        before = self._bags.get(key)
+        saved = None if before is None else (before.size, before.seed, before.offset)
+        # Reserved without awaiting, so concurrent deals never hand out the same position
+        positions = self.draw_positions(guild_id, category, size, k)
+        bag = self._bags[key]
+        drawn_to = bag.offset
+        
+        items = await catalog.items_at(category, positions)
+        if len(items) < k:
+            # Items were removed meanwhile; give the positions back unless another deal drew after us
+            if self._bags.get(key) is bag and bag.offset == drawn_to:
+                if saved is None:
+                    del self._bags[key]
+                else:
+                    self._bags[key] = ShuffleBag(*saved)
+            return []
+        
+        await asyncio.to_thread(self._write, self._snapshot())
+        return items
+    
+    def _snapshot(self) -> Dict[str, List[int]]:
+        return {key: [bag.seed, bag.offset, bag.size] for key, bag in (self._bags or {}).items()}
+    
+    def _write(self, data: Dict[str, List[int]]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with self._write_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Error saving shuffle bags: {e}")
+    
+    def save(self) -> None:
+        """Write all bags to the state file atomically (blocking)."""
+        if self._bags is not None:
+            self._write(self._snapshot())
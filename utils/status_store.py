@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger('discord_bot.status_store')
+
+DEFAULT_DB_PATH = "data/bot_status.db"
+
+class StatusStore:
+    """
+    Latest bot status snapshot, shared between processes through a small SQLite file.
+    
+    The bot process publishes a snapshot every time it refreshes its status;
+    dashboard workers (gunicorn, or the Flask thread) read it back. Every
+    publish bumps a version number, so a reader only checks one integer per
+    request and re-parses the JSON only when a new snapshot has arrived.
+    Nothing here imports discord.py.
+    """
+    
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, stale_after: float = 90.0):
+        self.db_path = db_path
+        self.stale_after = stale_after  # A snapshot older than this means the bot isn't running
+        self._local = threading.local()  # One connection per thread
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_version = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshot ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), "
+                "version INTEGER NOT NULL, "
+                "updated REAL NOT NULL, "
+                "data TEXT NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+    
+    def publish(self, status: Dict[str, Any]) -> int:
+        """Store a new snapshot (blocking). Returns its version."""
+        data = json.dumps(status, separators=(',', ':'), default=str)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO snapshot (id, version, updated, data) VALUES (1, 1, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET version = version + 1, updated = excluded.updated, data = excluded.data",
+                (time.time(), data)
+            )
+            version = conn.execute("SELECT version FROM snapshot WHERE id = 1").fetchone()[0]
+        return version
+    
+    def read(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the latest snapshot, or None if the bot has never published one.
+        
+        The returned dict is shared between callers and must not be modified.
+        If the snapshot is older than `stale_after`, it is returned with
+        "connected" set to False.
+        """
+        return self.read_versioned()[1]
+    
+    def read_versioned(self) -> Tuple[Tuple[int, bool], Optional[Dict[str, Any]]]:
+        """
+        Return (version, snapshot) like read(), where version identifies the snapshot's content.
+        
+        The version is the publish counter plus the connected flag, since a
+        snapshot going stale changes what read() returns.
+        """
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT version, updated FROM snapshot WHERE id = 1").fetchone()
+            if row is None:
+                return (0, False), None
+            version, updated = row
+            
+            with self._lock:
+                if version != self._cached_version:
+                    data = conn.execute("SELECT data FROM snapshot WHERE id = 1").fetchone()[0]
+                    self._cached = json.loads(data)
+                    self._cached_version = version
+                snapshot = self._cached
+        except sqlite3.Error as e:
+            logger.error(f"Error reading bot status snapshot: {e}")
+            return (0, False), None
+        
+        if time.time() - updated > self.stale_after and snapshot.get("connected"):
+            snapshot = dict(snapshot, connected=False)
+        return (version, bool(snapshot.get("connected"))), snapshot
+
+def changed_fields(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the top-level fields of `new` that differ from `old` (all of them if there is no `old`)."""
+    if old is None:
+        return dict(new)
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+def create_status_store() -> StatusStore:
+    """Create the store at the configured path."""
+    import config
+    return StatusStore(config.STATUS_DB_PATH, config.STATUS_STALE_AFTER)
+
+# Shared by the bot (publisher) and the dashboard (reader)
+status_store = create_status_store()
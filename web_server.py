@@ -78,10 +78,8 @@ def guild_details(guild_id):
     game_cog = discord_bot.get_cog('ActorGame')
     active_game = None
     if game_cog:
-        for channel_id, game in game_cog.active_games.items():
-            if game.channel.guild.id == guild_id:
-                active_game = game
-                break
+        guild_games = game_cog.games_in_guild(guild_id)
+        active_game = guild_games[0] if guild_games else None
     
     # Get music data for this guild
     music_cog = discord_bot.get_cog('MusicPlayer')
@@ -98,18 +96,11 @@ def guild_details(guild_id):
 @app.route('/actors')
 def actors():
     """Page showing all actors in the database."""
-    from utils.actor_database import ActorDatabase
-    import asyncio
-    
-    actor_db = ActorDatabase()
-    # Create event loop to run the async load_actors method
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(actor_db.load_actors())
+    from utils.actor_catalog import sync_actor_catalog
     
     # Get categories
-    hollywood_actors = loop.run_until_complete(actor_db.get_actors_by_category("hollywood"))
-    bollywood_actors = loop.run_until_complete(actor_db.get_actors_by_category("bollywood"))
+    hollywood_actors = sync_actor_catalog.get_category("hollywood")
+    bollywood_actors = sync_actor_catalog.get_category("bollywood")
     
     return render_template('actors.html',
                          bot_name=discord_bot.user.name if discord_bot else "Discord Bot",
@@ -119,8 +110,7 @@ def actors():
 @app.route('/actor/add', methods=['POST'])
 def add_actor():
     """Add a new actor to the database."""
-    from utils.actor_database import ActorDatabase
-    import asyncio
+    from utils.actor_catalog import sync_actor_catalog
     
     category = request.form.get('category')
     actor_name = request.form.get('actor_name')
@@ -129,16 +119,8 @@ def add_actor():
         flash("Category and actor name are required.", "danger")
         return redirect(url_for('actors'))
     
-    actor_db = ActorDatabase()
-    # Create event loop to run the async add_actor method
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    # Load actors first
-    loop.run_until_complete(actor_db.load_actors())
-    
-    # Add the actor
-    success = loop.run_until_complete(actor_db.add_actor(category.lower(), actor_name))
+    # Add the actor; the shared catalog saves it
+    success = sync_actor_catalog.add(category.lower(), actor_name)
     
     if success:
         flash(f"Actor '{actor_name}' added to {category} successfully.", "success")
@@ -150,8 +132,7 @@ def add_actor():
 @app.route('/actor/remove', methods=['POST'])
 def remove_actor():
     """Remove an actor from the database."""
-    from utils.actor_database import ActorDatabase
-    import asyncio
+    from utils.actor_catalog import sync_actor_catalog
     
     category = request.form.get('category')
     actor_name = request.form.get('actor_name')
@@ -160,16 +141,8 @@ def remove_actor():
         flash("Category and actor name are required.", "danger")
         return redirect(url_for('actors'))
     
-    actor_db = ActorDatabase()
-    # Create event loop to run the async remove_actor method
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    # Load actors first
-    loop.run_until_complete(actor_db.load_actors())
-    
-    # Remove the actor
-    success = loop.run_until_complete(actor_db.remove_actor(category.lower(), actor_name))
+    # Remove the actor; the shared catalog saves it
+    success = sync_actor_catalog.remove(category.lower(), actor_name)
     
     if success:
         flash(f"Actor '{actor_name}' removed from {category} successfully.", "success")